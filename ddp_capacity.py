@@ -20,6 +20,8 @@ import argparse
 import sys
 import os
 import math
+from ddp_profile import setup_profile, profile_stage
+from ddp_model import DRIVE_CAP, COEFFICIENTS, effective_for_usable
 
 ##########################################################################
 ## Function definitions                                                 ##
@@ -33,6 +35,7 @@ def parse_arguments():
     parser = argparse.ArgumentParser()
     parser.add_argument('-v', "--verbose", action='count',default=0)
     parser.add_argument("--logfile", type=str)
+    parser.add_argument("--profile", type=str, nargs='?', const='.', help="write per stage cProfile and tracemalloc output to this directory")
     args = parser.parse_args()
     args.program_name=os.path.basename(sys.argv[0])
     return args
@@ -88,8 +91,6 @@ def setup_log():
     log.addHandler(ch)
     return(log)
 
-
-
 ##########################################################################
 ## Main                                                                 ##
 ##########################################################################
@@ -97,6 +98,7 @@ if __name__ == '__main__':
   
     args = parse_arguments()
     log = setup_log()
+    setup_profile(args.profile, args.program_name, log)
 
     log.info(args.program_name + ' begins')
     DRIVE =[
@@ -106,14 +108,6 @@ if __name__ == '__main__':
     "30TB-SSD",
     "60TB-SSD",
     ]
-    # Drive sizes (using GB found in maint manual, converted to GiB)
-    DRIVE_CAP = {
-        "3.8TB-SSD" : 3521.26,
-        "7.6TB-SSD" : 7042.52,
-        "15TB-SSD" : 14015.00,
-        "30TB-SSD" : 28028.99,
-        "60TB-SSD" : 56058.00
-    }
    
     ADR_OPTIONS =[
     "Compression Only",
@@ -126,6 +120,9 @@ if __name__ == '__main__':
     "6+2"
     ]
 
+    # Compression and Dedupe metadata and garbage rates from ddp_model
+    DRD_METADATA, DRS_METADATA, GARBAGE = COEFFICIENTS["Compression and Dedupe"]
+
     STRIPE_EFFICIENCY = {
         "14+2" : (1-(2/16)),
         "6+2" : (1-(2/8))
@@ -141,46 +138,48 @@ if __name__ == '__main__':
     Stripe_size = []
     ADR_selection = []
 
-    for x in range(9,33):
-        log.info('drive count: ' +str(x))
-        for cap in DRIVE:
-            log.info('looking at ' + cap)
-            for stripe in STRIPES :
-                log.info('looking at stripe size ' + stripe)
-                ddp_cap = 0
-                if (x<17):
-                    if stripe=='6+2':
+    with profile_stage('sizing'):
+        for x in range(9,33):
+            log.info('drive count: ' +str(x))
+            for cap in DRIVE:
+                log.info('looking at ' + cap)
+                for stripe in STRIPES :
+                    log.info('looking at stripe size ' + stripe)
+                    ddp_cap = 0
+                    if (x<17):
+                        if stripe=='6+2':
+                            ddp_cap = math.floor((x-1)*(DRIVE_CAP[cap])*(STRIPE_EFFICIENCY[stripe])*.98)
+                    else:
                         ddp_cap = math.floor((x-1)*(DRIVE_CAP[cap])*(STRIPE_EFFICIENCY[stripe])*.98)
-                else:
-                    ddp_cap = math.floor((x-1)*(DRIVE_CAP[cap])*(STRIPE_EFFICIENCY[stripe])*.98)
 
-                if ddp_cap:
-                    log.warning('ddp capacity is ' +str(ddp_cap))
-                    #print(f"{x} {cap} drives with {stripe} provides {ddp_cap} GiB usable")
-                    DDP_capacity[str(x)+'_'+cap+'_'+stripe] = ddp_cap
+                    if ddp_cap:
+                        log.warning('ddp capacity is ' +str(ddp_cap))
+                        #print(f"{x} {cap} drives with {stripe} provides {ddp_cap} GiB usable")
+                        DDP_capacity[str(x)+'_'+cap+'_'+stripe] = ddp_cap
     
-    print("Config,DDP Capacity (GiB),90% Pool Depletion(GiB), DRD Effective supported (2:1), DRD Effective (3:1), DRD Effective (4:1), DRS Effective (2:1), DRS Effective (2.5:1), DRS Effective (3:1), DRS Effective (3.5:1), DRS Effective (4:1)")
-    for config in DDP_capacity:
-        log.info('working on pool size with ' + config)
-        dp90 = round(DDP_capacity[config] * .9,2)
-        log.info('effective capacity supported in pool with ' + str(dp90) +'TiB at 3:1')
-        # effective/ratio + metadata + garbage = capacity required.  calculating effective given capacity available (dp90):
-        # metadata is .03 effective, garbage is .07 (effective/ratio)
-        # dp90 = (1.07 Effective/3) + .03 effective
-        # dp90 - .03E = 1.07 Effective/3
-        # 3dp90 - .09E = 1.07 E
-        # 3dp90 = 1.16E
-        # E = 3*dp90/1.16
-        eff_3 = math.floor(3*dp90/1.16)
-        eff_2 = math.floor(2*dp90/1.13)
-        eff_4 = math.floor(4*dp90/1.19)
-        drs_4 = math.floor(4*dp90/1.31)
-        drs_35 = math.floor(3.5*dp90/1.28)
-        drs_3 = math.floor(3*dp90/1.25)
-        drs_25 = math.floor(2.5*dp90/1.22)
-        drs_2 = math.floor(2*dp90/1.19)
-        Eff_capacity[config]=eff_3
-        print(f"{config},{DDP_capacity[config]},{dp90},{eff_2},{eff_3},{eff_4},{drs_2},{drs_25},{drs_3},{drs_35},{drs_4}")
+    with profile_stage('output'):
+        print("Config,DDP Capacity (GiB),90% Pool Depletion(GiB), DRD Effective supported (2:1), DRD Effective (3:1), DRD Effective (4:1), DRS Effective (2:1), DRS Effective (2.5:1), DRS Effective (3:1), DRS Effective (3.5:1), DRS Effective (4:1)")
+        for config in DDP_capacity:
+            log.info('working on pool size with ' + config)
+            dp90 = round(DDP_capacity[config] * .9,2)
+            log.info('effective capacity supported in pool with ' + str(dp90) +'TiB at 3:1')
+            # effective/ratio + metadata + garbage = capacity required.  calculating effective given capacity available (dp90):
+            # metadata is .03 (DRD) or .06 (DRS) effective, garbage is .07 (effective/ratio)
+            # dp90 = (1.07 Effective/3) + .03 effective
+            # dp90 - .03E = 1.07 Effective/3
+            # 3dp90 - .09E = 1.07 E
+            # 3dp90 = 1.16E
+            # E = 3*dp90/1.16
+            eff_3 = math.floor(effective_for_usable(dp90, 3, DRD_METADATA, GARBAGE))
+            eff_2 = math.floor(effective_for_usable(dp90, 2, DRD_METADATA, GARBAGE))
+            eff_4 = math.floor(effective_for_usable(dp90, 4, DRD_METADATA, GARBAGE))
+            drs_4 = math.floor(effective_for_usable(dp90, 4, DRS_METADATA, GARBAGE))
+            drs_35 = math.floor(effective_for_usable(dp90, 3.5, DRS_METADATA, GARBAGE))
+            drs_3 = math.floor(effective_for_usable(dp90, 3, DRS_METADATA, GARBAGE))
+            drs_25 = math.floor(effective_for_usable(dp90, 2.5, DRS_METADATA, GARBAGE))
+            drs_2 = math.floor(effective_for_usable(dp90, 2, DRS_METADATA, GARBAGE))
+            Eff_capacity[config]=eff_3
+            print(f"{config},{DDP_capacity[config]},{dp90},{eff_2},{eff_3},{eff_4},{drs_2},{drs_25},{drs_3},{drs_35},{drs_4}")
                     
 
     """ log.critical('crit') # always prints
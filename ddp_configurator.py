@@ -7,6 +7,8 @@ Author         : John McDevitt
 Function       : Takes effective capacity inputs and generates DDP config
                :
 Usage          : takes no input
+               : --jnl-trace FILE --link-mbps N [--outage-minutes N] sizes the HUR journal from
+                 a timestamp,MB/s write trace and uses it as the pools' JNL capacity
 Update Log     : version 1.0
                : version 1.1 small formatting updates, default values
                : 20230211 version 1.2 14+2 support
@@ -20,6 +22,11 @@ Update Log     : version 1.0
                : v1.6 20230213 should limit capacities.  3PiB for a pool, maybe prompt for array type and limit effective capacity
                : v1.7 20230309 multiple pools, better output window, internal redesign
                : v1.8 20240505 DRD and DRS.  only journals w/o ADR
+               : v1.9 20261019 --profile for per stage cProfile/tracemalloc output
+               : v1.10 20261019 workload targets, performance estimate and layout comparison
+               : v1.11 20261019 journal sizing from host write traces (--jnl-trace or per pool Trace button)
+               : v1.12 20261019 drive catalog (capacity and performance), ADR coefficients, sizing and
+                 workload arithmetic from ddp_model.py
 To Dos         : Include multi-CBX options
                : Include relative pricing
                : Anchor results windows 
@@ -34,9 +41,20 @@ import argparse
 import sys
 import os
 import math
+import mmap
+import collections
+from datetime import datetime
 from tkinter import *
 from tkinter import messagebox
+from tkinter import filedialog
 from tkinter import ttk
+from ddp_profile import setup_profile, profile_stage
+from ddp_model import DRIVE_CAP, STRIPE_GEOMETRY, COEFFICIENTS, adr_overhead, pool_size_required, effective_supported
+from ddp_model import layout_performance, performance_drives, candidate_layouts
+from ddp_model import calc_ddp as model_ddp, calc_raid as model_raid
+
+# replaced by setup_log() when run as a script
+log = logging.getLogger(__name__)
 
 ##########################################################################
 ## Function definitions                                                 ##
@@ -51,7 +69,17 @@ def parse_arguments():
     parser = argparse.ArgumentParser()
     parser.add_argument('-v', "--verbose", action='count',default=0)
     parser.add_argument("--logfile", type=str)
+    parser.add_argument("--profile", type=str, nargs='?', const='.', help="write per stage cProfile and tracemalloc output to this directory")
+    parser.add_argument("--jnl-trace", type=str, help="host write trace (timestamp,MB/s csv) to size the journal from")
+    parser.add_argument("--link-mbps", type=float, help="replication link bandwidth in MB/s")
+    parser.add_argument("--outage-minutes", type=float, default=0, help="replication link outage the journal must ride out")
     args = parser.parse_args()
+    if args.jnl_trace and args.link_mbps is None:
+        parser.error("--jnl-trace needs --link-mbps")
+    if args.link_mbps is not None and args.link_mbps <= 0:
+        parser.error("--link-mbps must be greater than 0")
+    if args.outage_minutes < 0:
+        parser.error("--outage-minutes must not be negative")
     args.program_name=sys.argv[0]
     return args
 
@@ -101,6 +129,111 @@ def setup_log():
         log.addHandler(ch)
     return(log)
 
+def show_layouts(pool_size, target_iops, target_mbs, read_pct):
+    compare = Tk()
+    compare.title("Layout performance - " + str(pool_size) + " TiB")
+    compare.bind("q",lambda x: compare.destroy())
+    for col, heading in enumerate(["Layout","Drive","Stripe","Drives","Capacity (TiB)","IOPS","MB/s"]):
+        ttk.Label(compare,text=heading).grid(row=0,column=col,padx=4)
+    with profile_stage('sizing'):
+        layouts = candidate_layouts(pool_size, target_iops, target_mbs, read_pct, DRIVE, STRIPES)
+    for row, layout in enumerate(layouts):
+        for col, value in enumerate(layout):
+            ttk.Label(compare,text=str(value)).grid(row=row+1,column=col,padx=4)
+
+def read_trace(path):
+    ''' write trace samples
+
+    yields (seconds, MB/s) from a timestamp,MB/s csv.  the file is memory mapped and
+    read a line at a time so multi-GB traces are never held in memory.  timestamps are
+    epoch seconds or ISO 8601; header and unparseable lines are skipped
+    '''
+    with open(path,'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(),0,access=mmap.ACCESS_READ) as trace:
+            for line in iter(trace.readline, b''):
+                fields = line.split(b',')
+                if len(fields) < 2:
+                    continue
+                try:
+                    rate = float(fields[1])
+                    stamp = fields[0].strip().decode()
+                    try:
+                        seconds = float(stamp)
+                    except ValueError:
+                        seconds = datetime.fromisoformat(stamp).timestamp()
+                except ValueError:
+                    log.debug('skipping trace line ' + repr(line))
+                    continue
+                yield(seconds, rate)
+
+def journal_required(samples, link_mbps, outage_seconds):
+    ''' journal capacity (TiB) for a write trace
+
+    single pass.  each sample's rate applies from the previous sample up to it.  backlog
+    is what the journal holds because writes outran the link (it drains again when they
+    fall below it).  an outage from s to s+outage_seconds needs the backlog at s plus
+    everything written in the outage; that is largest with s or s+outage_seconds on a
+    sample, so both are checked as the trace goes by.  a deque holds the (time,
+    cumulative MB, backlog, rate in) points of the last outage_seconds, and an interval
+    straddling the outage start only counts for the part inside it.  the journal is the
+    worst outage or the worst backlog
+    '''
+    points = collections.deque()
+    anchor = None
+    written = 0.0
+    backlog = 0.0
+    required_mb = 0.0
+    previous = None
+    for seconds, rate in samples:
+        if previous is None:
+            points.append((seconds, written, backlog, 0.0))
+            previous = seconds
+            continue
+        if seconds <= previous:
+            log.warning('trace timestamp ' + str(seconds) + ' is not after ' + str(previous) + ', skipped')
+            continue
+        interval = seconds - previous
+        before = written
+        written += rate*interval
+        backlog = max(0.0, backlog + (rate-link_mbps)*interval)
+        points.append((seconds, written, backlog, rate))
+        start = seconds - outage_seconds
+        # outages starting on a sample, ending in this interval
+        while points and points[0][0] <= start:
+            anchor = points.popleft()
+            outage_mb = anchor[2] + before - anchor[1] + rate*(anchor[0] + outage_seconds - previous)
+            required_mb = max(required_mb, outage_mb)
+        # the outage ending now, from start (in the interval after anchor)
+        if anchor is None:
+            outage_mb = written
+        elif not points:
+            outage_mb = anchor[2]
+        else:
+            into = start - anchor[0]
+            following_rate = points[0][3]
+            outage_mb = max(0.0, anchor[2] + (following_rate-link_mbps)*into) + written - anchor[1] - following_rate*into
+        required_mb = max(required_mb, backlog, outage_mb)
+        previous = seconds
+    # MB (decimal, as hosts report it) to TiB, rounded up
+    return(math.ceil(required_mb*10**6/2**40*100)/100)
+
+def size_journal(path):
+    log.info('sizing journal from ' + path + ' with a ' + str(args.link_mbps) + ' MB/s link and ' + str(args.outage_minutes) + ' minute outage')
+    with profile_stage('input'):
+        jnl = journal_required(read_trace(path), args.link_mbps, args.outage_minutes*60)
+    log.info('journal required is ' + str(jnl) + ' TiB')
+    return(jnl)
+
+def trace_journal(jnl_var):
+    if args.link_mbps is None:
+        messagebox.showerror('Journal sizing','Start with --link-mbps (and --outage-minutes) to size journals from a trace')
+        return
+    path = filedialog.askopenfilename(title="Host write trace (timestamp,MB/s)")
+    if path:
+        jnl_var.set(size_journal(path))
+
 def terminate(event=''):
     sys.exit()
 
@@ -122,180 +255,168 @@ def calculate(event=''):
         return(ddp_dict)
     
     def calc_ddp(pool_size):
-        match Stripe_size[i].get():
-            case "14+2":
-                log.info('using 14+2')
-                DATA_STRIPE = 14
-                PARITY_STRIPE = 16
-                EFFICIENCY = .875
-            case "6+2":
-                log.info("using 6+2")
-                DATA_STRIPE = 6
-                PARITY_STRIPE = 8
-                EFFICIENCY = .75
-            case _:
-                log.info('only raid 6 today...')
+        log.info('using ' + Stripe_size[i].get())
+        DATA_STRIPE, PARITY_STRIPE, EFFICIENCY = STRIPE_GEOMETRY[Stripe_size[i].get()]
         
         log.info('calc_ddp with ' + str(pool_size))
-        required_drives = math.ceil(pool_size*1024/DRIVE_CAP[Prefered_Drive[i].get()]/EFFICIENCY)
-        log.info('minimum required drives, with parity but not spare space, for pool is ' + str(required_drives))
+        required_drives = model_ddp(pool_size, Prefered_Drive[i].get(), Stripe_size[i].get())[0]
+        log.info('minimum required drives, with parity but not spare space, for pool is ' + str(required_drives) + ' (at least ' + str(PARITY_STRIPE) + ', one stripe with parity)')
         DDPs = {}
-        if required_drives < PARITY_STRIPE:
-            log.info("padding required drives to match stripe with parity")
-            required_drives = PARITY_STRIPE
+        perf_required = performance_drives(Prefered_Drive[i].get(), DATA_STRIPE, PARITY_STRIPE, Target_IOPS[i].get(), Target_MBs[i].get(), Read_pct[i].get())
+        if perf_required > required_drives:
+            log.info('raising required drives from ' + str(required_drives) + ' to ' + str(perf_required) + ' for the workload target')
+        required_drives, configured_drives, ddp_capacity = model_ddp(pool_size, Prefered_Drive[i].get(), Stripe_size[i].get(), perf_required)
         log.info("calling balance")
-        DDPs=balance(required_drives,(required_drives//31)+1)
-        configured_drives = required_drives + (required_drives//31)+1
+        with profile_stage('balancing'):
+            DDPs=balance(required_drives,(required_drives//31)+1)
         log.info('configured drives is required drives plus one for each DDP for spare capacity ' +str(configured_drives))
         ttk.Label(results,text=str(configured_drives),foreground="orange").grid(row=10,column=1)
-        ddp_capacity = required_drives * DRIVE_CAP[Prefered_Drive[i].get()]/1024*EFFICIENCY
         log.info("required drives " +str(required_drives) + " ddp capacity " + str(ddp_capacity))
         ttk.Label(results,text=str(round(ddp_capacity,2)),foreground="green").grid(row=8,column=1)
                 
-        max_usable_capacity = ddp_capacity*(Depletion_threshold[i].get()/100)
-        log.info('pool will have usable capacity (under depletion threshold) of: ' + str(max_usable_capacity))
-        
-        if DRD_capacity[i].get() > 0:
-            max_effective_capacity = round((max_usable_capacity-garbage-metadata)*Ratios[i].get(),2)
-        else:
-            max_effective_capacity = round(max_usable_capacity,2)
+        log.info('pool will have usable capacity (under depletion threshold) of: ' + str(ddp_capacity*(Depletion_threshold[i].get()/100)))
+        max_effective_capacity = effective_supported(ddp_capacity, Depletion_threshold[i].get(), Ratios[i].get(), DRD_capacity[i].get(), metadata, garbage)
         log.info('which yields an ADR max effective of: ' + str(max_effective_capacity))
         ttk.Label(results,text=str(max_effective_capacity),foreground="red").grid(row=9,column=1)
         return(DDPs)
   
     def calc_raid(pool_size):
-        match Stripe_size[i].get():
-            case "14+2":
-                log.info('using 14+2')
-                DATA_STRIPE = 14
-                PARITY_STRIPE = 16
-                EFFICIENCY = .875
-            case "6+2":
-                log.info("using 6+2")
-                DATA_STRIPE = 6
-                PARITY_STRIPE = 8
-                EFFICIENCY = .75
-            case _:
-                log.info('only raid 6 today...')
+        log.info('using ' + Stripe_size[i].get())
+        DATA_STRIPE, PARITY_STRIPE, EFFICIENCY = STRIPE_GEOMETRY[Stripe_size[i].get()]
         log.info('calc_raid with ' + str(pool_size))
-        required_drives = math.ceil(pool_size*1024/DRIVE_CAP[Prefered_Drive[i].get()])
-        log.info('required drives ' + str(required_drives))
-        pg_count = math.ceil(required_drives/DATA_STRIPE)
+        pg_count = model_raid(pool_size, Prefered_Drive[i].get(), Stripe_size[i].get())[0]
+        log.info('required data drives ' + str(pg_count*DATA_STRIPE))
+        perf_required = performance_drives(Prefered_Drive[i].get(), DATA_STRIPE, PARITY_STRIPE, Target_IOPS[i].get(), Target_MBs[i].get(), Read_pct[i].get())
+        if math.ceil(perf_required/PARITY_STRIPE) > pg_count:
+            log.info('raising PG count to ' + str(math.ceil(perf_required/PARITY_STRIPE)) + ' for the workload target')
+        pg_count, pg_drives, raid_capacity = model_raid(pool_size, Prefered_Drive[i].get(), Stripe_size[i].get(), perf_required)
         log.info('PG count is ' +str(pg_count))
-        max_usable_capacity = pg_count*DATA_STRIPE*DRIVE_CAP[Prefered_Drive[i].get()]/1024*(Depletion_threshold[i].get()/100)
+        max_usable_capacity = raid_capacity*(Depletion_threshold[i].get()/100)
         log.info('working max cap ' + str(max_usable_capacity))
-        if DRD_capacity[i].get() > 0:
-            max_effective_capacity = round((max_usable_capacity-garbage-metadata)*Ratios[i].get(),2)
-        else:
-            max_effective_capacity = round(max_usable_capacity,2)
+        max_effective_capacity = effective_supported(raid_capacity, Depletion_threshold[i].get(), Ratios[i].get(), DRD_capacity[i].get(), metadata, garbage)
         log.info('which yields an ADR max effective of: ' + str(max_effective_capacity))       
         log.info('RAID pool will have usable capacity (under depletion threshold) of : ' + str(max_usable_capacity))
-        log.info('minimum required data drives for pool is ' + str(required_drives))
-        log.info('minimum number of parity groups is ' + str(math.ceil(required_drives/DATA_STRIPE)))
-        log.info('total PG drive count is ' + str((math.ceil(required_drives/DATA_STRIPE)*PARITY_STRIPE)))
-        log.info('recommended spares (one for each 32 drives) ' + str((math.ceil(required_drives/DATA_STRIPE)*PARITY_STRIPE)//32 + 1))
-        ttk.Label(results,text=str(round(pg_count*DATA_STRIPE*DRIVE_CAP[Prefered_Drive[i].get()]/1024,2)),foreground="green").grid(row=15+d,column=1)
+        log.info('minimum required data drives for pool is ' + str(pg_count*DATA_STRIPE))
+        log.info('minimum number of parity groups is ' + str(pg_count))
+        log.info('total PG drive count is ' + str(pg_drives))
+        log.info('recommended spares (one for each 32 drives) ' + str(pg_drives//32 + 1))
+        ttk.Label(results,text=str(round(raid_capacity,2)),foreground="green").grid(row=15+d,column=1)
         ttk.Label(results,text=str(max_effective_capacity),foreground="red").grid(row=16+d,column=1)
-        ttk.Label(results,text=str((math.ceil(required_drives/DATA_STRIPE)*PARITY_STRIPE)),foreground="orange").grid(row=17+d,column=1)
-        ttk.Label(results,text=str((math.ceil(required_drives/DATA_STRIPE)*PARITY_STRIPE)//32 + 1),foreground="orange").grid(row=18+d,column=1)
+        ttk.Label(results,text=str(pg_drives),foreground="orange").grid(row=17+d,column=1)
+        ttk.Label(results,text=str(pg_drives//32 + 1),foreground="orange").grid(row=18+d,column=1)
         ttk.Label(results,text=str(pg_count)).grid(row=19+d,column=1)
         
-        return()
+        return(pg_drives)
     
     log.info('in calculate')
     log.info('number of pools is ' + str(pool_count))
     for i in range(pool_count):
         log.debug('i is ' + str(i))
-        log.info('DRD effcap of pool is ' + str(DRD_capacity[i].get()))
-        log.info('DRS effcap of pool is ' + str(DRS_capacity[i].get()))
-        log.info('JNL cap of pool is ' + str(JNL_capacity[i].get()))
-        # if Pool_capacity[i].get() < DRD_capacity[i].get():
-        #     messagebox.showerror('Capacity mismatch','The Total Customer Data includes ADR data\nIt must be greater than or equal to the ADR value')
-        #     return
-        # else:
-        #     HDP_cap = Pool_capacity[i].get() - DRD_capacity[i].get()
-        #     log.info('HDP portion of capacity is ' + str(HDP_cap))
-        # if Pool_capacity[i].get() > 3000:
-        #     messagebox.showerror('Pool capacity','HDP pool built on internal drives limited to ~3PiB')
-        #     return
-        if Depletion_threshold[i].get()/100 < .8:
-            messagebox.showerror('Depletion threshold','Depletion threshold should be between 80 and 100%')
-            return
-        elif Depletion_threshold[i].get()/100 > 1:
-            messagebox.showerror('Depletion threshold','Depletion threshold should be between 80 and 100%')
+        with profile_stage('input'):
+            log.info('DRD effcap of pool is ' + str(DRD_capacity[i].get()))
+            log.info('DRS effcap of pool is ' + str(DRS_capacity[i].get()))
+            log.info('JNL cap of pool is ' + str(JNL_capacity[i].get()))
+            # if Pool_capacity[i].get() < DRD_capacity[i].get():
+            #     messagebox.showerror('Capacity mismatch','The Total Customer Data includes ADR data\nIt must be greater than or equal to the ADR value')
+            #     return
+            # else:
+            #     HDP_cap = Pool_capacity[i].get() - DRD_capacity[i].get()
+            #     log.info('HDP portion of capacity is ' + str(HDP_cap))
+            # if Pool_capacity[i].get() > 3000:
+            #     messagebox.showerror('Pool capacity','HDP pool built on internal drives limited to ~3PiB')
+            #     return
+            # checks only record the error; the dialog is shown once the input stage is
+            # closed so time spent reading it is not profiled as input
+            error = None
+            log.info('checking ADR selection with ' + str(ADR_selection[i].get()))
+            if Depletion_threshold[i].get()/100 < .8:
+                error = ('Depletion threshold','Depletion threshold should be between 80 and 100%')
+            elif Depletion_threshold[i].get()/100 > 1:
+                error = ('Depletion threshold','Depletion threshold should be between 80 and 100%')
+            elif Read_pct[i].get() < 0 or Read_pct[i].get() > 100:
+                error = ('Workload','Read percentage should be between 0 and 100%')
+            elif ADR_selection[i].get() == "No Data Reduction" and DRD_capacity[i].get() > 0:
+                error = ("ADR mismatch","'No Data Reduction' set, but ADR capacity present")
+            else:
+                log.info(ADR_selection[i].get() + ' -- metadata calculation is ' + str(COEFFICIENTS[ADR_selection[i].get()][0]) + ' of DRD cap and ' + str(COEFFICIENTS[ADR_selection[i].get()][1]) + ' of DRS cap')
+                metadata, garbage = adr_overhead(ADR_selection[i].get(), float(DRD_capacity[i].get()), float(DRS_capacity[i].get()), float(Ratios[i].get()))
+            
+                log.info('required pool capacity is (JNL capacity + (ADR effective capacities / ADR ratio) + metadata + garbage)/depletion threshold')
+                log.debug('(' +str(JNL_capacity[i].get()) + ' + (' + str(DRD_capacity[i].get()) + '+ ' + str(DRS_capacity[i].get()) + ' / ' + str(Ratios[i].get()) + ') + ' + str(metadata) + ' + ' + str(garbage) + ' )/ ' + str(Depletion_threshold[i].get()/100))
+                pool_size = pool_size_required(JNL_capacity[i].get(), DRD_capacity[i].get(), DRS_capacity[i].get(), Ratios[i].get(), Depletion_threshold[i].get(), ADR_selection[i].get())
+                log.info("Pool size is " + str(pool_size))
+        if error:
+            messagebox.showerror(*error)
             return
-        
-        log.info('checking ADR selection with ' + str(ADR_selection[i].get()))
-        match ADR_selection[i].get():
-            case "No Data Reduction":
-                garbage=0
-                metadata = 0.0
-                if DRD_capacity[i].get() > 0:
-                    messagebox.showerror("ADR mismatch","'No Data Reduction' set, but ADR capacity present")
-                    return 
-            case "Compression Only":
-                log.info('Compression only -- metadata calculation is 0.02 of DRD cap and 0.04 of DRS cap')
-                metadata = (float(DRD_capacity[i].get()) * 0.02) + (float(DRS_capacity[i].get()) * 0.04)
-                garbage = (float(DRD_capacity[i].get())+float(DRS_capacity[i].get()))/float(Ratios[i].get()) * 0.07
-            case "Compression and Dedupe":
-                log.info('Comp and Deduupe metadata calculations is 0.03 of DRD cap and 0.06 of DRS cap')
-                metadata = (float(DRD_capacity[i].get()) * 0.03) + (float(DRS_capacity[i].get()) * 0.06)
-                garbage = float(DRD_capacity[i].get())/float(Ratios[i].get()) * 0.07
-        
-        log.info('required pool capacity is (JNL capacity + (ADR effective capacities / ADR ratio) + metadata + garbage)/depletion threshold')
-        log.debug('(' +str(JNL_capacity[i].get()) + ' + (' + str(DRD_capacity[i].get()) + '+ ' + str(DRS_capacity[i].get()) + ' / ' + str(Ratios[i].get()) + ') + ' + str(metadata) + ' + ' + str(garbage) + ' )/ ' + str(Depletion_threshold[i].get()/100))
-        pool_size = round((JNL_capacity[i].get()+((DRD_capacity[i].get() + DRS_capacity[i].get())/Ratios[i].get())+metadata+garbage)/(Depletion_threshold[i].get()/100),2)
-        log.info("Pool size is " + str(pool_size))
 
-        results = Tk()
-        results.title("Pool configuration options")
-        results.geometry('+%s+%s' %(window.winfo_x()+400, window.winfo_y()))
-        results.bind("q",lambda x: results.destroy())
-        ttk.Label(results,text="Stripe size: ").grid(row=0,column=0)
-        match Stripe_size[i].get():
-            case "14+2":
-                ttk.Label(results,text="14+2").grid(row=0,column=1)
-            case "6+2":
-                ttk.Label(results,text="6+2").grid(row=0,column=1)
-        ttk.Label(results,text="Drive size (TiB): ").grid(row=1,column=0)
-        ttk.Label(results,text=str(Prefered_Drive[i].get())).grid(row=1,column=1)
-        ttk.Label(results,text="Pool size required (TiB): ").grid(row=2,column=0)
-        ttk.Label(results,text=str(pool_size),foreground="green").grid(row=2,column=1)
-        ttk.Label(results,text="Total Effective requested(TiB): ").grid(row=3,column=0)
-        ttk.Label(results,text=str(DRD_capacity[i].get()+DRS_capacity[i].get()),foreground="red").grid(row=3,column=1)
-        ttk.Label(results,text="Journal space requested(TiB): ").grid(row=4,column=0)
-        ttk.Label(results,text=str(JNL_capacity[i].get()),foreground="red").grid(row=4,column=1)
-        ttk.Separator(results,orient="horizontal").grid(row=5,columnspan=2,sticky="ew")
-        ttk.Label(results,text="---DDP Configuration---").grid(row=6,columnspan=2,sticky="ew")
-        ttk.Separator(results,orient="horizontal").grid(row=7,columnspan=2,sticky="ew")
-        ttk.Label(results,text="Pool size configured (TiB): ").grid(row=8,column=0)
-        ttk.Label(results,text="Effective supported(TiB): ").grid(row=9,column=0)
-        ttk.Label(results,text="Total DDP drives configured: ").grid(row=10,column=0)
+        with profile_stage('rendering'):
+            results = Tk()
+            results.title("Pool configuration options")
+            results.geometry('+%s+%s' %(window.winfo_x()+400, window.winfo_y()))
+            results.bind("q",lambda x: results.destroy())
+            ttk.Label(results,text="Stripe size: ").grid(row=0,column=0)
+            match Stripe_size[i].get():
+                case "14+2":
+                    ttk.Label(results,text="14+2").grid(row=0,column=1)
+                case "6+2":
+                    ttk.Label(results,text="6+2").grid(row=0,column=1)
+            ttk.Label(results,text="Drive size (TiB): ").grid(row=1,column=0)
+            ttk.Label(results,text=str(Prefered_Drive[i].get())).grid(row=1,column=1)
+            ttk.Label(results,text="Pool size required (TiB): ").grid(row=2,column=0)
+            ttk.Label(results,text=str(pool_size),foreground="green").grid(row=2,column=1)
+            ttk.Label(results,text="Total Effective requested(TiB): ").grid(row=3,column=0)
+            ttk.Label(results,text=str(DRD_capacity[i].get()+DRS_capacity[i].get()),foreground="red").grid(row=3,column=1)
+            ttk.Label(results,text="Journal space requested(TiB): ").grid(row=4,column=0)
+            ttk.Label(results,text=str(JNL_capacity[i].get()),foreground="red").grid(row=4,column=1)
+            ttk.Separator(results,orient="horizontal").grid(row=5,columnspan=2,sticky="ew")
+            ttk.Label(results,text="---DDP Configuration---").grid(row=6,columnspan=2,sticky="ew")
+            ttk.Separator(results,orient="horizontal").grid(row=7,columnspan=2,sticky="ew")
+            ttk.Label(results,text="Pool size configured (TiB): ").grid(row=8,column=0)
+            ttk.Label(results,text="Effective supported(TiB): ").grid(row=9,column=0)
+            ttk.Label(results,text="Total DDP drives configured: ").grid(row=10,column=0)
         
-        DDPs={}
-        log.info('calling calc_ddp with ' + str(pool_size))
-        DDPs=calc_ddp(pool_size)
+        with profile_stage('sizing'):
+            DDPs={}
+            log.info('calling calc_ddp with ' + str(pool_size))
+            DDPs=calc_ddp(pool_size)
         
-        for d in DDPs:
-            DDPs[d]+=1
-            ttk.Label(results,text='DDP ' + str(d+1) + ' drive count:').grid(row=(11+d),column=0)
-            ttk.Label(results,text=str(DDPs[d])).grid(row=(11+d),column=1)
-        log.info("balanced drive config is : " + str(DDPs))
+        with profile_stage('rendering'):
+            for d in DDPs:
+                DDPs[d]+=1
+                ttk.Label(results,text='DDP ' + str(d+1) + ' drive count:').grid(row=(11+d),column=0)
+                ttk.Label(results,text=str(DDPs[d])).grid(row=(11+d),column=1)
+            log.info("balanced drive config is : " + str(DDPs))
         
-        ttk.Separator(results,orient="horizontal").grid(row=12+d,columnspan=2,sticky="ew")
-        ttk.Label(results,text="---RAID PG Configuration---").grid(row=13+d,columnspan=2,sticky="ew")
-        ttk.Separator(results,orient="horizontal").grid(row=14+d,columnspan=2,sticky="ew")
-        ttk.Label(results,text="Pool size configured (TiB): ").grid(row=15+d,column=0)
-        ttk.Label(results,text="Effective supported(TiB): ").grid(row=16+d,column=0)
-        ttk.Label(results,text="Total PG drives configured: ").grid(row=17+d,column=0)
-        ttk.Label(results,text="Recommended Spare Drives: ").grid(row=18+d,column=0)
-        log.info('calling calc_raid with ' + str(pool_size))
-        calc_raid(pool_size)
-        match Stripe_size[i].get():
-            case "14+2":
-                ttk.Label(results,text="Traditional RAID 14+2 PGs: ").grid(row=19+d,column=0)
-            case "6+2":
-                ttk.Label(results,text="Traditional RAID 6+2 PGS: ").grid(row=19+d,column=0)
+            ttk.Separator(results,orient="horizontal").grid(row=12+d,columnspan=2,sticky="ew")
+            ttk.Label(results,text="---RAID PG Configuration---").grid(row=13+d,columnspan=2,sticky="ew")
+            ttk.Separator(results,orient="horizontal").grid(row=14+d,columnspan=2,sticky="ew")
+            ttk.Label(results,text="Pool size configured (TiB): ").grid(row=15+d,column=0)
+            ttk.Label(results,text="Effective supported(TiB): ").grid(row=16+d,column=0)
+            ttk.Label(results,text="Total PG drives configured: ").grid(row=17+d,column=0)
+            ttk.Label(results,text="Recommended Spare Drives: ").grid(row=18+d,column=0)
+            log.info('calling calc_raid with ' + str(pool_size))
+            with profile_stage('sizing'):
+                raid_drives = calc_raid(pool_size)
+            match Stripe_size[i].get():
+                case "14+2":
+                    ttk.Label(results,text="Traditional RAID 14+2 PGs: ").grid(row=19+d,column=0)
+                case "6+2":
+                    ttk.Label(results,text="Traditional RAID 6+2 PGS: ").grid(row=19+d,column=0)
+
+            DATA_STRIPE, PARITY_STRIPE, EFFICIENCY = STRIPE_GEOMETRY[Stripe_size[i].get()]
+            ddp_iops, ddp_mbs = layout_performance(sum(DDPs.values()), Prefered_Drive[i].get(), DATA_STRIPE, PARITY_STRIPE, Read_pct[i].get())
+            raid_iops, raid_mbs = layout_performance(raid_drives, Prefered_Drive[i].get(), DATA_STRIPE, PARITY_STRIPE, Read_pct[i].get())
+            log.info('DDP supports ' + str(ddp_iops) + ' IOPS ' + str(ddp_mbs) + ' MB/s, RAID supports ' + str(raid_iops) + ' IOPS ' + str(raid_mbs) + ' MB/s at ' + str(Read_pct[i].get()) + '% read')
+            ttk.Separator(results,orient="horizontal").grid(row=20+d,columnspan=2,sticky="ew")
+            ttk.Label(results,text="---Performance (" + str(Read_pct[i].get()) + "% read)---").grid(row=21+d,columnspan=2,sticky="ew")
+            ttk.Separator(results,orient="horizontal").grid(row=22+d,columnspan=2,sticky="ew")
+            ttk.Label(results,text="Workload requested (IOPS / MB/s): ").grid(row=23+d,column=0)
+            ttk.Label(results,text=str(Target_IOPS[i].get()) + ' / ' + str(Target_MBs[i].get()),foreground="red").grid(row=23+d,column=1)
+            ttk.Label(results,text="DDP supported (IOPS / MB/s): ").grid(row=24+d,column=0)
+            ttk.Label(results,text=str(ddp_iops) + ' / ' + str(ddp_mbs),foreground="green").grid(row=24+d,column=1)
+            ttk.Label(results,text="RAID supported (IOPS / MB/s): ").grid(row=25+d,column=0)
+            ttk.Label(results,text=str(raid_iops) + ' / ' + str(raid_mbs),foreground="green").grid(row=25+d,column=1)
+            ttk.Button(results,text="Compare layouts",command=lambda size=pool_size, iops=Target_IOPS[i].get(), mbs=Target_MBs[i].get(), read=Read_pct[i].get(): show_layouts(size, iops, mbs, read)).grid(row=26+d,columnspan=2,sticky=EW)
     
 def add_pool(row_count):
     global active_row
@@ -308,8 +429,11 @@ def add_pool(row_count):
     global Prefered_Drive
     global Stripe_size
     global ADR_selection
+    global Target_IOPS
+    global Target_MBs
+    global Read_pct
     
-    active_row += 9
+    active_row += 12
     
     log.info("in add_pool with row count " + str(row_count) + " and pool count " + str(pool_count))
     if pool_count > 0:
@@ -328,6 +452,9 @@ def add_pool(row_count):
     ttk.Label(window,text="DRIVE TYPE").grid(row=row_count+6, column=0,sticky=W)
     ttk.Label(window,text="Stripe configuration").grid(row=row_count+7,column=0,sticky=W)
     ttk.Label(window,text="Data Reduction Selection").grid(row=row_count+8,column=0,sticky=W)
+    ttk.Label(window,text="Target host IOPS (0 for none):").grid(row=row_count+9,column=0,sticky=W)
+    ttk.Label(window,text="Target host MB/s (0 for none):").grid(row=row_count+10,column=0,sticky=W)
+    ttk.Label(window,text="Workload read % (70 for 70%)").grid(row=row_count+11,column=0,sticky=W)
     
     # Total_Cap=DoubleVar()
     # Total_Cap.set(500)
@@ -355,8 +482,9 @@ def add_pool(row_count):
     Depletion_threshold.append(Depletion)
    
     JNL_Cap=DoubleVar()
-    JNL_Cap.set(10)
+    JNL_Cap.set(JNL_default)
     ttk.Entry(window,textvariable=JNL_Cap,width=4).grid(row=row_count+5,column=1,sticky=E)
+    ttk.Button(window,text="Trace...",width=6,command=lambda: trace_journal(JNL_Cap)).grid(row=row_count+5,column=2,sticky=W)
     JNL_capacity.append(JNL_Cap)
 
     preferred_drive_var= StringVar()
@@ -374,6 +502,21 @@ def add_pool(row_count):
     OptionMenu(window,ADR_selection_var,*ADR_OPTIONS).grid(row=row_count+8,column=1,sticky=EW)
     ADR_selection.append(ADR_selection_var)
 
+    target_iops_var=IntVar()
+    target_iops_var.set(0)
+    ttk.Entry(window,textvariable=target_iops_var,width=8).grid(row=row_count+9,column=1,sticky=E)
+    Target_IOPS.append(target_iops_var)
+
+    target_mbs_var=IntVar()
+    target_mbs_var.set(0)
+    ttk.Entry(window,textvariable=target_mbs_var,width=8).grid(row=row_count+10,column=1,sticky=E)
+    Target_MBs.append(target_mbs_var)
+
+    read_pct_var=IntVar()
+    read_pct_var.set(70)
+    ttk.Entry(window,textvariable=read_pct_var,width=4).grid(row=row_count+11,column=1,sticky=E)
+    Read_pct.append(read_pct_var)
+
 ##########################################################################
 ## Main                                                                 ##
 ##########################################################################
@@ -381,6 +524,7 @@ if __name__ == '__main__':
   
     args = parse_arguments()
     log = setup_log()
+    setup_profile(args.profile, args.program_name, log)
     log.info(args.program_name + ' begins')
 
     DRIVE =[
@@ -389,13 +533,6 @@ if __name__ == '__main__':
     "15TB-SSD",
     "30TB-SSD",
     ]
-    # Drive sizes (using GB found in maint manual, converted to GiB)
-    DRIVE_CAP = {
-        "3.8TB-SSD" : 3521.26,
-        "7.6TB-SSD" : 7042.52,
-        "15TB-SSD" : 14015.00,
-        "30TB-SSD" : 28028.99
-    }
    
     ADR_OPTIONS =[
     "Compression Only",
@@ -407,7 +544,6 @@ if __name__ == '__main__':
     "6+2"
     ]
 
-
     #Pool_capacity = []
     DRD_capacity = []
     DRS_capacity = []
@@ -417,6 +553,13 @@ if __name__ == '__main__':
     Prefered_Drive = []
     Stripe_size = []
     ADR_selection = []
+    Target_IOPS = []
+    Target_MBs = []
+    Read_pct = []
+
+    JNL_default = 10
+    if args.jnl_trace:
+        JNL_default = size_journal(args.jnl_trace)
     
     window = Tk()
     window.title("DDP pool configurator - v1.7")
@@ -427,8 +570,8 @@ if __name__ == '__main__':
     pool_count = 0
     add_pool(active_row)
     log.info('row and pool count ' + str(active_row) + ' ' + str(pool_count))
-    ttk.Button(window,text="Add pool", width=6,command=lambda: add_pool(active_row)).grid(row=32,column=0,sticky=EW)
-    ttk.Button(window,text="Configure", width=6,command=calculate).grid(row=32,column=1,sticky=EW)
+    ttk.Button(window,text="Add pool", width=6,command=lambda: add_pool(active_row)).grid(row=40,column=0,sticky=EW)
+    ttk.Button(window,text="Configure", width=6,command=calculate).grid(row=40,column=1,sticky=EW)
     
     window.mainloop()
     #log.warning('warn') # logs with -v
@@ -0,0 +1,300 @@
+#!/usr/local/bin/python3
+''' standard template
+
+ Script Name    : ddp_inventory_check.py
+ Created        : 20261019
+ Author         : John McDevitt
+ Function       : Stream pool inventory exports and compare real pool capacity and
+                : overhead against the DDP/RAID and ADR metadata/garbage model
+                : pools are flagged on overhead or net ratio divergence; physical divergence
+                : (built vs sized from current use) is reported on flagged pools for information
+ Usage          : ddp_inventory_check.py [-v] [--tolerance 0.1] [--output flagged.csv] inventory.csv [...]
+                : inventory columns (capacities in TiB, depletion in percent):
+                : array,pool,layout,drive,stripe,adr,depletion,drd_effective,drs_effective,jnl,used,physical,ratio
+                : "No Data Reduction" pools have no ADR overhead to compare; they are counted
+                : but neither flagged nor used for calibration
+ Update Log     :
+
+'''
+
+##########################################################################
+## Imports                                                              ##
+##########################################################################
+import logging
+import logging.handlers
+import argparse
+import sys
+import os
+import math
+import csv
+import itertools
+from ddp_profile import setup_profile, profile_stage
+from ddp_model import COEFFICIENTS, adr_features, adr_overhead, calc_ddp, calc_raid
+
+##########################################################################
+## Function definitions                                                 ##
+##########################################################################
+def parse_arguments():
+    ''' argument object
+
+    this is standard argument parsing.  add your required args below
+    '''
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-v', "--verbose", action='count',default=0)
+    parser.add_argument("--logfile", type=str)
+    parser.add_argument("--profile", type=str, nargs='?', const='.', help="write per stage cProfile and tracemalloc output to this directory")
+    parser.add_argument("inventory", nargs='+', help="pool inventory export(s), csv")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="rows held in memory at a time")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="relative divergence from the model that flags a pool")
+    parser.add_argument("--output", type=str, help="write flagged pools here instead of stdout")
+    args = parser.parse_args()
+    if args.chunk_size < 1:
+        parser.error('--chunk-size must be at least 1')
+    args.program_name=os.path.basename(sys.argv[0])
+    return args
+
+def setup_log():
+    ''' log object
+
+    Enable logging for the script utilizing the -v for verbose arguments
+    log.critical('crit') # always prints
+    log.error('error') # always logs
+    log.warning('warn') # logs with -v
+    log.info('info') # logs with -vv
+    log.debug('debug') # logs with -vvv
+    '''
+
+    # capture all log messages to the log files if provided
+    loglevel=logging.DEBUG
+
+    logformat='%(asctime)s %(name)s %(funcName)s %(levelname)s line: %(lineno)d %(message)s'
+    log = logging.getLogger(args.program_name)
+    log.setLevel(loglevel)
+    if args.logfile is None:
+        if 'LOGFILE' in os.environ:
+            if os.path.isdir(os.environ['LOGFILE']):
+                fh = logging.handlers.TimedRotatingFileHandler(os.path.join(os.environ['LOGFILE'],args.program_name + ".log"),'D',1,3)
+            else:
+                fh = logging.handlers.TimedRotatingFileHandler(os.environ['LOGFILE'],'D',1,3)
+            fh.setLevel(loglevel)
+            fh.setFormatter(logging.Formatter(logformat))
+    elif os.path.isdir(args.logfile):
+        fh = logging.handlers.TimedRotatingFileHandler(os.path.join(args.logfile,args.program_name + ".log"),'D',1,3)
+    else:
+        fh = logging.handlers.TimedRotatingFileHandler(args.logfile,'D',1,3)
+
+    if args.logfile or ('LOGFILE' in os.environ):
+        fh.setLevel(loglevel)
+        fh.setFormatter(logging.Formatter(logformat))
+        log.addHandler(fh)
+
+    # only log to the console if using -v
+    if args.verbose == 1:
+        loglevel = logging.WARNING
+    elif args.verbose == 2:
+        loglevel = logging.INFO
+    elif args.verbose > 2:
+        loglevel = logging.DEBUG
+    else:
+        loglevel = logging.ERROR
+
+    ch = logging.StreamHandler()
+    ch.setLevel(loglevel)
+    ch.setFormatter(logging.Formatter(logformat))
+    log.addHandler(ch)
+    return(log)
+
+def divergence(actual, model):
+    if model == 0:
+        return(0.0 if actual == 0 else math.inf)
+    return((actual-model)/model)
+
+def check_pool(row):
+    ''' compare one inventory row to the model
+
+    returns the model figures and relative divergences for the row.  raises
+    ValueError/KeyError on rows that can't be modeled
+    '''
+    adr = row['adr']
+    drd = float(row['drd_effective'])
+    drs = float(row['drs_effective'])
+    ratio = float(row['ratio'])
+    jnl = float(row['jnl'] or 0)
+    used = float(row['used'])
+    physical = float(row['physical'])
+    depletion = float(row['depletion'])/100
+    if ratio <= 0:
+        raise ValueError('ratio must be positive')
+    if not 0 < depletion <= 1:
+        raise ValueError('depletion must be between 0 and 100')
+
+    data = (drd+drs)/ratio
+    metadata, garbage = adr_overhead(adr, drd, drs, ratio)
+    model_overhead = metadata + garbage
+    actual_overhead = used - jnl - data
+    log.debug(row['array'] + '/' + row['pool'] + ' overhead actual ' + str(actual_overhead) + ' model ' + str(model_overhead))
+
+    # net ratio is effective over everything ADR actually consumes, overhead included
+    model_used = jnl + data + model_overhead
+    actual_net_ratio = (drd+drs)/(used-jnl) if used > jnl else 0.0
+    model_net_ratio = (drd+drs)/(model_used-jnl) if model_used > jnl else 0.0
+
+    # re-run the sizing on the modeled requirement and compare against what was built.
+    # informational only: a pool not yet filled to its threshold is built larger than this
+    pool_size = model_used/depletion
+    match row['layout'].upper():
+        case "DDP":
+            required_drives, model_drives, model_physical = calc_ddp(pool_size, row['drive'], row['stripe'])
+        case "RAID":
+            pg_count, model_drives, model_physical = calc_raid(pool_size, row['drive'], row['stripe'])
+        case _:
+            raise ValueError('unknown layout ' + row['layout'])
+
+    return({
+        'model_overhead' : round(model_overhead,2),
+        'actual_overhead' : round(actual_overhead,2),
+        'overhead_divergence' : divergence(actual_overhead, model_overhead),
+        'model_net_ratio' : round(model_net_ratio,3),
+        'actual_net_ratio' : round(actual_net_ratio,3),
+        'ratio_divergence' : divergence(actual_net_ratio, model_net_ratio),
+        'model_drives' : model_drives,
+        'model_physical' : round(model_physical,2),
+        'physical_divergence' : divergence(physical, model_physical),
+    }, adr_features(adr, drd, drs, ratio), actual_overhead)
+
+def accumulate(adr, features, overhead):
+    ''' add one pool to the running least squares sums for its ADR type
+
+    only X'X and X'y are kept, so calibration memory does not grow with the fleet
+    '''
+    xtx, xty, n = FIT.setdefault(adr, [[[0.0]*3 for _ in range(3)], [0.0]*3, 0])
+    for r in range(3):
+        xty[r] += features[r]*overhead
+        for c in range(3):
+            xtx[r][c] += features[r]*features[c]
+    FIT[adr][2] = n+1
+
+def solve(matrix, vector):
+    ''' gaussian elimination with partial pivoting, None if singular
+
+    the system is scaled to unit diagonal first, so a pivot is the share of that term
+    the other terms can't explain.  collinear features (e.g. every pool at the same
+    ratio) leave pivots of rounding noise, or too small to fit against, rather than zero
+    '''
+    size = len(vector)
+    if min(matrix[r][r] for r in range(size)) <= 0:
+        return(None)
+    scale = [math.sqrt(matrix[r][r]) for r in range(size)]
+    m = [[matrix[r][c]/(scale[r]*scale[c]) for c in range(size)] + [vector[r]/scale[r]] for r in range(size)]
+    for col in range(size):
+        pivot = max(range(col,size), key=lambda r: abs(m[r][col]))
+        if abs(m[pivot][col]) < SINGULAR_TOLERANCE:
+            return(None)
+        m[col], m[pivot] = m[pivot], m[col]
+        for r in range(col+1,size):
+            factor = m[r][col]/m[col][col]
+            for c in range(col,size+1):
+                m[r][c] -= factor*m[col][c]
+    result = [0.0]*size
+    for r in reversed(range(size)):
+        result[r] = (m[r][size] - sum(m[r][c]*result[c] for c in range(r+1,size)))/m[r][r]
+    return([result[r]/scale[r] for r in range(size)])
+
+def calibrate(adr):
+    ''' fitted coefficients for an ADR type
+
+    terms the fleet never exercised (e.g. no DRS pools) keep their current coefficient;
+    their contribution is moved to the right hand side and the rest are fitted.  None if
+    the fleet can't separate the terms
+    '''
+    xtx, xty, n = FIT[adr]
+    current = COEFFICIENTS[adr]
+    active = [k for k in range(3) if xtx[k][k] > 0]
+    fixed = [k for k in range(3) if k not in active]
+    matrix = [[xtx[r][c] for c in active] for r in active]
+    vector = [xty[r] - sum(xtx[r][k]*current[k] for k in fixed) for r in active]
+    fitted = solve(matrix, vector) if active else []
+    if fitted is None:
+        log.warning('calibration for ' + adr + ' is singular (too little ratio spread?), keeping current coefficients')
+        return(None)
+    result = list(current)
+    for k, value in zip(active, fitted):
+        result[k] = value
+    return(result)
+
+
+
+##########################################################################
+## Main                                                                 ##
+##########################################################################
+if __name__ == '__main__':
+
+    args = parse_arguments()
+    log = setup_log()
+    setup_profile(args.profile, args.program_name, log)
+
+    log.info(args.program_name + ' begins')
+    FIT = {}
+    # smallest pivot of the unit diagonal X'X solve() will fit against; roughly the
+    # squared relative spread of ratios across the fleet
+    SINGULAR_TOLERANCE = 1e-4
+    rows = 0
+    skipped = 0
+    flagged = 0
+    unreduced = 0
+
+    out = open(args.output,'w',newline='') if args.output else sys.stdout
+    writer = None
+    for inventory in args.inventory:
+        log.info('reading ' + inventory)
+        with open(inventory,newline='') as f:
+            reader = csv.DictReader(f)
+            while True:
+                with profile_stage('input'):
+                    chunk = list(itertools.islice(reader, args.chunk_size))
+                if not chunk:
+                    break
+                log.info('chunk of ' + str(len(chunk)) + ' pools starting at row ' + str(rows+1))
+                divergent = []
+                with profile_stage('sizing'):
+                    for row in chunk:
+                        rows += 1
+                        try:
+                            result, features, overhead = check_pool(row)
+                        except (KeyError, ValueError, TypeError) as e:
+                            log.error(inventory + ' row ' + str(rows) + ' skipped: ' + repr(e))
+                            skipped += 1
+                            continue
+                        # everything in a No Data Reduction pool is unreduced data, no ADR overhead to check
+                        if row['adr'] == "No Data Reduction":
+                            unreduced += 1
+                            continue
+                        accumulate(row['adr'], features, overhead)
+                        if max(abs(result['overhead_divergence']), abs(result['ratio_divergence'])) > args.tolerance:
+                            for k in ('overhead_divergence','ratio_divergence','physical_divergence'):
+                                result[k] = round(result[k],4)
+                            row.update(result)
+                            divergent.append(row)
+                with profile_stage('output'):
+                    for row in divergent:
+                        flagged += 1
+                        if writer is None:
+                            writer = csv.DictWriter(out, fieldnames=list(row.keys()), extrasaction='ignore')
+                            writer.writeheader()
+                        writer.writerow(row)
+    if args.output:
+        out.close()
+
+    log.warning(str(rows) + ' pools read, ' + str(flagged) + ' flagged, ' + str(unreduced) + ' without data reduction, ' + str(skipped) + ' skipped')
+    print(f"{rows} pools, {flagged} outside {args.tolerance:.0%} of model, {unreduced} without data reduction (not checked), {skipped} skipped", file=sys.stderr)
+    print("ADR,Pools,DRD metadata (model/fitted),DRS metadata (model/fitted),Garbage (model/fitted)", file=sys.stderr)
+    for adr in FIT:
+        fitted = calibrate(adr)
+        current = COEFFICIENTS[adr]
+        if fitted is None:
+            print(f"{adr},{FIT[adr][2]},{current[0]}/not fitted,{current[1]}/not fitted,{current[2]}/not fitted", file=sys.stderr)
+            continue
+        print(f"{adr},{FIT[adr][2]},{current[0]}/{fitted[0]:.4f},{current[1]}/{fitted[1]:.4f},{current[2]}/{fitted[2]:.4f}", file=sys.stderr)
+
+    log.info(args.program_name + ' ends')
@@ -0,0 +1,177 @@
+#!/usr/local/bin/python3
+''' standard template
+
+ Script Name    : ddp_model.py
+ Created        : 20261019
+ Author         : John McDevitt
+ Function       : Drive catalog (capacity and performance), stripe geometry, ADR metadata/garbage
+                : coefficients and the pool / DDP / RAID sizing and workload arithmetic shared by
+                : the DDP tools.  Recalibrating
+                : the coefficients (see ddp_inventory_check.py) means editing COEFFICIENTS here
+ Usage          : from ddp_model import DRIVE_CAP, COEFFICIENTS, calc_ddp, ...
+ Update Log     :
+
+'''
+
+##########################################################################
+## Imports                                                              ##
+##########################################################################
+import math
+
+##########################################################################
+## Catalog and coefficients                                             ##
+##########################################################################
+# Drive sizes (using GB found in maint manual, converted to GiB)
+DRIVE_CAP = {
+    "3.8TB-SSD" : 3521.26,
+    "7.6TB-SSD" : 7042.52,
+    "15TB-SSD" : 14015.00,
+    "30TB-SSD" : 28028.99,
+    "60TB-SSD" : 56058.00
+}
+
+# Per drive performance behind the controller, nominal datasheet figures
+# (8K random read IOPS, 8K random write IOPS, sequential read MB/s, sequential write MB/s)
+DRIVE_PERF = {
+    "3.8TB-SSD" : (60000, 20000, 900, 600),
+    "7.6TB-SSD" : (60000, 20000, 900, 600),
+    "15TB-SSD" : (55000, 15000, 900, 500),
+    "30TB-SSD" : (50000, 10000, 900, 450),
+    "60TB-SSD" : (45000, 8000, 900, 400)
+}
+# RAID 6 small write: read data, P and Q then write data, P and Q
+RAID6_WRITE_PENALTY = 6
+
+# data drives, drives per stripe with parity, efficiency
+STRIPE_GEOMETRY = {
+    "14+2" : (14, 16, .875),
+    "6+2" : (6, 8, .75)
+}
+
+# DRD metadata, DRS metadata, garbage -- fractions of DRD effective, DRS effective and
+# of the stored data garbage is charged against (see adr_features)
+COEFFICIENTS = {
+    "Compression Only" : (0.02, 0.04, 0.07),
+    "Compression and Dedupe" : (0.03, 0.06, 0.07),
+    "No Data Reduction" : (0.0, 0.0, 0.0)
+}
+
+##########################################################################
+## Function definitions                                                 ##
+##########################################################################
+def adr_features(adr, drd, drs, ratio):
+    ''' overhead basis
+
+    the ADR overhead model is linear in three terms: DRD effective and DRS effective
+    (metadata) and the stored data that garbage is charged against.  returns the three
+    terms so the same vector feeds both the model and the calibration fit
+    '''
+    match adr:
+        case "Compression Only":
+            return([drd, drs, (drd+drs)/ratio])
+        case "Compression and Dedupe":
+            return([drd, drs, drd/ratio])
+        case _:
+            return([0.0, 0.0, 0.0])
+
+def adr_overhead(adr, drd, drs, ratio):
+    ''' (metadata, garbage) in TiB for an ADR selection '''
+    coef = COEFFICIENTS[adr]
+    features = adr_features(adr, drd, drs, ratio)
+    metadata = features[0]*coef[0] + features[1]*coef[1]
+    garbage = features[2]*coef[2]
+    return(metadata, garbage)
+
+def pool_size_required(jnl, drd, drs, ratio, depletion, adr):
+    ''' (JNL capacity + (ADR effective capacities / ADR ratio) + metadata + garbage)/depletion threshold
+
+    depletion is a percentage, as entered in ddp_configurator
+    '''
+    metadata, garbage = adr_overhead(adr, drd, drs, ratio)
+    return(round((jnl + (drd+drs)/ratio + metadata + garbage)/(depletion/100),2))
+
+def calc_ddp(pool_size, drive, stripe, min_drives=0):
+    ''' DDP sizing
+
+    returns required drives (with parity, without spare space), configured drives (one
+    spare drive's capacity per DDP) and DDP capacity in TiB.  min_drives raises the
+    required drives, e.g. for a workload target
+    '''
+    DATA_STRIPE, PARITY_STRIPE, EFFICIENCY = STRIPE_GEOMETRY[stripe]
+    required_drives = max(math.ceil(pool_size*1024/DRIVE_CAP[drive]/EFFICIENCY), PARITY_STRIPE, min_drives)
+    configured_drives = required_drives + (required_drives//31)+1
+    ddp_capacity = required_drives * DRIVE_CAP[drive]/1024*EFFICIENCY
+    return(required_drives, configured_drives, ddp_capacity)
+
+def calc_raid(pool_size, drive, stripe, min_drives=0):
+    ''' traditional RAID PG sizing
+
+    returns PG count, PG drive count and RAID capacity in TiB.  min_drives raises the PG
+    count so the PGs hold at least that many drives
+    '''
+    DATA_STRIPE, PARITY_STRIPE, EFFICIENCY = STRIPE_GEOMETRY[stripe]
+    pg_count = max(math.ceil(math.ceil(pool_size*1024/DRIVE_CAP[drive])/DATA_STRIPE), math.ceil(min_drives/PARITY_STRIPE))
+    raid_capacity = pg_count*DATA_STRIPE*DRIVE_CAP[drive]/1024
+    return(pg_count, pg_count*PARITY_STRIPE, raid_capacity)
+
+def workload_cost(drive, data_stripe, parity_stripe, read_pct):
+    ''' drive-seconds per host IO and per host MB
+
+    reads cost one back end IO.  random writes pay the RAID 6 penalty whatever the
+    stripe width, sequential writes only lose the parity share of each stripe
+    (2 of 16 for 14+2, 2 of 8 for 6+2)
+    '''
+    read_iops, write_iops, read_mbs, write_mbs = DRIVE_PERF[drive]
+    read = read_pct/100
+    per_io = read/read_iops + (1-read)*RAID6_WRITE_PENALTY/write_iops
+    per_mb = read/read_mbs + (1-read)*parity_stripe/(data_stripe*write_mbs)
+    return(per_io, per_mb)
+
+def layout_performance(drives, drive, data_stripe, parity_stripe, read_pct):
+    ''' host IOPS and MB/s a layout of drives can sustain at read_pct reads '''
+    per_io, per_mb = workload_cost(drive, data_stripe, parity_stripe, read_pct)
+    return(round(drives/per_io), round(drives/per_mb))
+
+def performance_drives(drive, data_stripe, parity_stripe, target_iops, target_mbs, read_pct):
+    ''' minimum drives to carry the target workload, 0 when there is no target '''
+    per_io, per_mb = workload_cost(drive, data_stripe, parity_stripe, read_pct)
+    return(math.ceil(max(target_iops*per_io, target_mbs*per_mb)))
+
+def candidate_layouts(pool_size, target_iops, target_mbs, read_pct, drives=DRIVE_CAP, stripes=STRIPE_GEOMETRY):
+    ''' every drive/stripe as DDP and as RAID PGs
+
+    one pass over the catalog (or the drives and stripes given) sizing each layout for
+    capacity, raising the drive count where the workload needs more drives than the
+    capacity does
+    '''
+    layouts = []
+    for drive in drives:
+        for stripe in stripes:
+            DATA_STRIPE, PARITY_STRIPE, EFFICIENCY = STRIPE_GEOMETRY[stripe]
+            perf_required = performance_drives(drive, DATA_STRIPE, PARITY_STRIPE, target_iops, target_mbs, read_pct)
+
+            required_drives, configured_drives, ddp_capacity = calc_ddp(pool_size, drive, stripe, perf_required)
+            layouts.append(("DDP", drive, stripe, configured_drives, round(ddp_capacity,2)) + layout_performance(configured_drives, drive, DATA_STRIPE, PARITY_STRIPE, read_pct))
+
+            pg_count, pg_drives, raid_capacity = calc_raid(pool_size, drive, stripe, perf_required)
+            layouts.append(("RAID", drive, stripe, pg_drives, round(raid_capacity,2)) + layout_performance(pg_drives, drive, DATA_STRIPE, PARITY_STRIPE, read_pct))
+    return(layouts)
+
+def effective_supported(capacity, depletion, ratio, drd, metadata, garbage):
+    ''' max ADR effective a configured pool supports, as reported by ddp_configurator '''
+    max_usable_capacity = capacity*(depletion/100)
+    if drd > 0:
+        return(round((max_usable_capacity-garbage-metadata)*ratio,2))
+    return(round(max_usable_capacity,2))
+
+def effective_for_usable(usable, ratio, metadata_rate, garbage_rate):
+    ''' effective capacity that fits in usable capacity
+
+    effective/ratio + metadata + garbage = usable, with metadata = metadata_rate*effective
+    and garbage = garbage_rate*effective/ratio, so
+    effective = ratio*usable / (ratio*metadata_rate + 1 + garbage_rate)
+
+    the divisor is rounded back to the decimal the coefficients describe (1.13, not
+    1.1300000000000001) so floored results match the published tables
+    '''
+    return(ratio*usable/round(ratio*metadata_rate + 1 + garbage_rate,10))
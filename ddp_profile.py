@@ -0,0 +1,104 @@
+#!/usr/local/bin/python3
+''' standard template
+
+ Script Name    : ddp_profile.py
+ Created        : 20261019
+ Author         : John McDevitt
+ Function       : --profile support shared by the DDP tools.  cProfile stats and tracemalloc
+                : snapshots per stage, with a wall time / peak memory summary at exit
+ Usage          : from ddp_profile import setup_profile, profile_stage
+                : setup_profile(args.profile, args.program_name, log) once after setup_log()
+                : with profile_stage('sizing'): ...
+ Update Log     :
+
+'''
+
+##########################################################################
+## Imports                                                              ##
+##########################################################################
+import logging
+import sys
+import os
+import time
+import atexit
+import contextlib
+import cProfile
+import tracemalloc
+
+##########################################################################
+## Module state                                                         ##
+##########################################################################
+profile_dir = None
+program_name = ''
+log = logging.getLogger(__name__)
+profile_stats = {}
+profile_stack = []
+
+##########################################################################
+## Function definitions                                                 ##
+##########################################################################
+def setup_profile(directory, name, logger):
+    ''' enable profiling when --profile was given (directory is None otherwise) '''
+    global profile_dir, program_name, log
+    profile_dir = directory
+    program_name = os.path.basename(name)
+    log = logger
+    if profile_dir is not None:
+        atexit.register(profile_report)
+
+@contextlib.contextmanager
+def profile_stage(stage):
+    ''' profiling context
+
+    with --profile the enclosed block runs under cProfile and tracemalloc, and its wall
+    time and peak traced memory are charged to stage.  a nested stage pauses the one
+    around it so each stage only reports its own time
+    '''
+    if profile_dir is None:
+        yield
+        return
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if profile_stack:
+        profile_pause(profile_stack[-1])
+    stats = profile_stats.setdefault(stage, {'profiler' : cProfile.Profile(), 'calls' : 0, 'wall' : 0.0, 'peak' : 0, 'snapshot' : None})
+    stats['calls'] += 1
+    profile_stack.append([stage, 0.0])
+    profile_resume(profile_stack[-1])
+    try:
+        yield
+    finally:
+        profile_pause(profile_stack.pop())
+        if profile_stack:
+            profile_resume(profile_stack[-1])
+
+def profile_pause(frame):
+    ''' stop charging frame's stage.  a snapshot is only taken when the stage reaches a new peak '''
+    stats = profile_stats[frame[0]]
+    stats['profiler'].disable()
+    stats['wall'] += time.perf_counter() - frame[1]
+    peak = tracemalloc.get_traced_memory()[1]
+    if peak > stats['peak']:
+        stats['peak'] = peak
+        stats['snapshot'] = tracemalloc.take_snapshot()
+
+def profile_resume(frame):
+    tracemalloc.reset_peak()
+    frame[1] = time.perf_counter()
+    profile_stats[frame[0]]['profiler'].enable()
+
+def profile_report():
+    ''' profiling output
+
+    write <program>_<stage>.prof (cProfile) and <program>_<stage>.tracemalloc (snapshot
+    at the stage's highest peak) to the --profile directory and print the per stage summary
+    '''
+    os.makedirs(profile_dir, exist_ok=True)
+    print("Stage,Calls,Wall (s),Peak memory (MiB)", file=sys.stderr)
+    for stage, stats in profile_stats.items():
+        base = os.path.join(profile_dir, program_name + '_' + stage)
+        stats['profiler'].dump_stats(base + '.prof')
+        if stats['snapshot'] is not None:
+            stats['snapshot'].dump(base + '.tracemalloc')
+        print(f"{stage},{stats['calls']},{stats['wall']:.3f},{stats['peak']/1024/1024:.2f}", file=sys.stderr)
+    log.info('profile written to ' + profile_dir)
@@ -0,0 +1,351 @@
+#!/usr/local/bin/python3
+''' standard template
+
+ Script Name    : ddp_scenarios.py
+ Created        : 20261019
+ Author         : John McDevitt
+ Function       : Scenario store for pool configurations.  Scenarios are derived from a
+                : base scenario with overrides, kept in SQLite with their sizing results.
+                : Results are recomputed only for scenarios whose effective inputs (or the
+                : model coefficients/catalog) changed since the last run
+ Usage          : ddp_scenarios.py [--db FILE] add NAME [--base BASE] [--set key=value ...]
+                : ddp_scenarios.py update NAME [--set key=value ...] [--unset key ...]
+                : ddp_scenarios.py remove NAME
+                : ddp_scenarios.py run
+                : ddp_scenarios.py list
+                : ddp_scenarios.py diff [NAME ...]   (each vs its base, or the other NAMEs vs the
+                :                                    first; a single NAME compares every scenario to it)
+                : keys: drd, drs, ratio, depletion, jnl, drive, stripe, adr
+                : adr="No Data Reduction" needs drd=0 and drs=0, as in ddp_configurator
+ Update Log     :
+
+'''
+
+##########################################################################
+## Imports                                                              ##
+##########################################################################
+import logging
+import logging.handlers
+import argparse
+import sys
+import os
+import math
+import json
+import hashlib
+import sqlite3
+from ddp_profile import setup_profile, profile_stage
+from ddp_model import DRIVE_CAP, STRIPE_GEOMETRY, COEFFICIENTS, adr_overhead, pool_size_required, calc_ddp, calc_raid, effective_supported
+
+##########################################################################
+## Function definitions                                                 ##
+##########################################################################
+def parse_arguments():
+    ''' argument object
+
+    this is standard argument parsing.  add your required args below
+    '''
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-v', "--verbose", action='count',default=0)
+    parser.add_argument("--logfile", type=str)
+    parser.add_argument("--profile", type=str, nargs='?', const='.', help="write per stage cProfile and tracemalloc output to this directory")
+    parser.add_argument("--db", type=str, default="ddp_scenarios.db", help="scenario store")
+    commands = parser.add_subparsers(dest='command', required=True)
+    add = commands.add_parser('add', help="add a scenario")
+    add.add_argument("name")
+    add.add_argument("--base", type=str, help="scenario to derive from, defaults otherwise")
+    add.add_argument("--set", dest='overrides', action='append', default=[], metavar="KEY=VALUE")
+    update = commands.add_parser('update', help="change a scenario's overrides")
+    update.add_argument("name")
+    update.add_argument("--set", dest='overrides', action='append', default=[], metavar="KEY=VALUE")
+    update.add_argument("--unset", action='append', default=[], metavar="KEY")
+    remove = commands.add_parser('remove', help="remove a scenario with no derived scenarios")
+    remove.add_argument("name")
+    commands.add_parser('run', help="recompute results that are out of date")
+    commands.add_parser('list', help="show scenarios and results")
+    diff = commands.add_parser('diff', help="result differences, each scenario vs its base or all vs the first name")
+    diff.add_argument("names", nargs='*')
+    args = parser.parse_args()
+    args.program_name=os.path.basename(sys.argv[0])
+    return args
+
+def setup_log():
+    ''' log object
+
+    Enable logging for the script utilizing the -v for verbose arguments
+    log.critical('crit') # always prints
+    log.error('error') # always logs
+    log.warning('warn') # logs with -v
+    log.info('info') # logs with -vv
+    log.debug('debug') # logs with -vvv
+    '''
+
+    # capture all log messages to the log files if provided
+    loglevel=logging.DEBUG
+
+    logformat='%(asctime)s %(name)s %(funcName)s %(levelname)s line: %(lineno)d %(message)s'
+    log = logging.getLogger(args.program_name)
+    log.setLevel(loglevel)
+    if args.logfile is None:
+        if 'LOGFILE' in os.environ:
+            if os.path.isdir(os.environ['LOGFILE']):
+                fh = logging.handlers.TimedRotatingFileHandler(os.path.join(os.environ['LOGFILE'],args.program_name + ".log"),'D',1,3)
+            else:
+                fh = logging.handlers.TimedRotatingFileHandler(os.environ['LOGFILE'],'D',1,3)
+            fh.setLevel(loglevel)
+            fh.setFormatter(logging.Formatter(logformat))
+    elif os.path.isdir(args.logfile):
+        fh = logging.handlers.TimedRotatingFileHandler(os.path.join(args.logfile,args.program_name + ".log"),'D',1,3)
+    else:
+        fh = logging.handlers.TimedRotatingFileHandler(args.logfile,'D',1,3)
+
+    if args.logfile or ('LOGFILE' in os.environ):
+        fh.setLevel(loglevel)
+        fh.setFormatter(logging.Formatter(logformat))
+        log.addHandler(fh)
+
+    # only log to the console if using -v
+    if args.verbose == 1:
+        loglevel = logging.WARNING
+    elif args.verbose == 2:
+        loglevel = logging.INFO
+    elif args.verbose > 2:
+        loglevel = logging.DEBUG
+    else:
+        loglevel = logging.ERROR
+
+    ch = logging.StreamHandler()
+    ch.setLevel(loglevel)
+    ch.setFormatter(logging.Formatter(logformat))
+    log.addHandler(ch)
+    return(log)
+
+def fail(message):
+    log.error(message)
+    sys.exit(1)
+
+def open_store(path):
+    db = sqlite3.connect(path)
+    db.execute("PRAGMA foreign_keys = ON")
+    db.execute("CREATE TABLE IF NOT EXISTS scenarios (name TEXT PRIMARY KEY, base TEXT REFERENCES scenarios(name), overrides TEXT NOT NULL)")
+    db.execute("CREATE TABLE IF NOT EXISTS results (name TEXT PRIMARY KEY REFERENCES scenarios(name) ON DELETE CASCADE, input_hash TEXT NOT NULL, inputs TEXT NOT NULL, "
+               + ", ".join(field + " NUMERIC" for field in RESULT_FIELDS) + ")")
+    return(db)
+
+def parse_overrides(pairs):
+    ''' key=value strings to an overrides dict, checked against the inputs and catalog '''
+    overrides = {}
+    for pair in pairs:
+        key, sep, value = pair.partition('=')
+        if not sep or key not in DEFAULTS:
+            fail('override ' + repr(pair) + ' should be key=value with key one of ' + ', '.join(DEFAULTS))
+        match key:
+            case "drive":
+                if value not in DRIVE_CAP:
+                    fail('drive should be one of ' + ', '.join(DRIVE_CAP))
+            case "stripe":
+                if value not in STRIPE_GEOMETRY:
+                    fail('stripe should be one of ' + ', '.join(STRIPE_GEOMETRY))
+            case "adr":
+                if value not in COEFFICIENTS:
+                    fail('adr should be one of ' + ', '.join(COEFFICIENTS))
+            case _:
+                try:
+                    value = float(value)
+                except ValueError:
+                    fail(key + ' should be a number, not ' + repr(value))
+                if not math.isfinite(value):
+                    fail(key + ' should be a number, not ' + repr(value))
+                match key:
+                    case "ratio":
+                        if value <= 0:
+                            fail('ratio should be greater than 0')
+                    case "depletion":
+                        if value < 80 or value > 100:
+                            fail('depletion should be between 80 and 100')
+                    case _:
+                        if value < 0:
+                            fail(key + ' capacity should not be negative')
+        overrides[key] = value
+    return(overrides)
+
+def effective_inputs(scenarios):
+    ''' resolve every scenario to its full input set, base first then its overrides '''
+    resolved = {}
+    def resolve(name):
+        if name not in resolved:
+            base, overrides = scenarios[name]
+            inputs = dict(resolve(base)) if base else dict(DEFAULTS)
+            inputs.update(overrides)
+            resolved[name] = inputs
+        return(resolved[name])
+    for name in scenarios:
+        resolve(name)
+    return(resolved)
+
+def check_inputs(scenarios):
+    ''' fail if any scenario resolves to inputs ddp_configurator would reject
+
+    checked on add and update for every scenario, as a change to a base reaches the
+    scenarios derived from it
+    '''
+    for name, inputs in effective_inputs(scenarios).items():
+        if inputs['adr'] == "No Data Reduction" and inputs['drd'] + inputs['drs'] > 0:
+            fail('scenario ' + name + ": 'No Data Reduction' set, but ADR capacity present (drd " + str(inputs['drd']) + ', drs ' + str(inputs['drs']) + ')')
+
+def input_hash(inputs):
+    ''' changes when the scenario's inputs or anything in the model changes '''
+    return(hashlib.sha1(json.dumps([inputs, MODEL_SIGNATURE], sort_keys=True).encode()).hexdigest())
+
+def size_scenario(inputs):
+    ''' ddp_configurator's pool, DDP and RAID sizing for one scenario '''
+    drd, drs, ratio, depletion, adr = inputs['drd'], inputs['drs'], inputs['ratio'], inputs['depletion'], inputs['adr']
+    metadata, garbage = adr_overhead(adr, drd, drs, ratio)
+    pool_size = pool_size_required(inputs['jnl'], drd, drs, ratio, depletion, adr)
+    required_drives, ddp_drives, ddp_capacity = calc_ddp(pool_size, inputs['drive'], inputs['stripe'])
+    pg_count, raid_drives, raid_capacity = calc_raid(pool_size, inputs['drive'], inputs['stripe'])
+    return({
+        'pool_size' : pool_size,
+        'ddp_drives' : ddp_drives,
+        'ddp_capacity' : round(ddp_capacity,2),
+        'ddp_effective' : effective_supported(ddp_capacity, depletion, ratio, drd, metadata, garbage),
+        'raid_pgs' : pg_count,
+        'raid_drives' : raid_drives,
+        'raid_capacity' : round(raid_capacity,2),
+        'raid_effective' : effective_supported(raid_capacity, depletion, ratio, drd, metadata, garbage),
+    })
+
+def load_scenarios(db):
+    return({name : (base, json.loads(overrides)) for name, base, overrides in db.execute("SELECT name, base, overrides FROM scenarios")})
+
+def run(db):
+    ''' incremental re-evaluation
+
+    every scenario is resolved (cheap) and hashed; only scenarios whose hash differs
+    from the stored result are sized again
+    '''
+    with profile_stage('input'):
+        resolved = effective_inputs(load_scenarios(db))
+        stored = dict(db.execute("SELECT name, input_hash FROM results"))
+    stale = []
+    with profile_stage('sizing'):
+        for name, inputs in resolved.items():
+            digest = input_hash(inputs)
+            if stored.get(name) != digest:
+                log.info('recomputing ' + name)
+                results = size_scenario(inputs)
+                stale.append([name, digest, json.dumps(inputs, sort_keys=True)] + [results[field] for field in RESULT_FIELDS])
+    with profile_stage('output'):
+        if stale:
+            db.executemany("INSERT OR REPLACE INTO results (name, input_hash, inputs, " + ", ".join(RESULT_FIELDS) + ") VALUES ("
+                           + ", ".join("?"*(len(RESULT_FIELDS)+3)) + ")", stale)
+            db.commit()
+    log.warning(str(len(stale)) + ' of ' + str(len(resolved)) + ' scenarios recomputed')
+    return(len(stale), len(resolved))
+
+def diff(db, names):
+    ''' bulk result deltas
+
+    one query joins every scenario to its reference (its base, or the first name given)
+    and returns changed inputs and result deltas for all of them at once.  with only a
+    reference name, every other scenario is compared to it
+    '''
+    deltas = ", ".join("r." + field + " - b." + field for field in RESULT_FIELDS)
+    if names:
+        if len(names) > 1:
+            selection = "s.name IN (" + ", ".join("?"*len(names[1:])) + ")"
+            parameters = names
+        else:
+            selection = "s.name != ?"
+            parameters = names*2
+        query = ("SELECT s.name, b.name, r.inputs, b.inputs, " + deltas + " FROM scenarios s JOIN results r ON r.name = s.name JOIN results b ON b.name = ? "
+                 + "WHERE " + selection + " ORDER BY s.name")
+        rows = db.execute(query, parameters)
+    else:
+        query = ("SELECT s.name, b.name, r.inputs, b.inputs, " + deltas + " FROM scenarios s JOIN results r ON r.name = s.name JOIN results b ON b.name = s.base "
+                 + "ORDER BY s.name")
+        rows = db.execute(query)
+    print("Scenario,Reference,Changed inputs," + ",".join("delta " + field for field in RESULT_FIELDS))
+    for row in rows:
+        inputs, reference_inputs = json.loads(row[2]), json.loads(row[3])
+        changed = "; ".join(key + " " + str(reference_inputs[key]) + "->" + str(inputs[key]) for key in DEFAULTS if inputs[key] != reference_inputs[key])
+        print(f"{row[0]},{row[1]},{changed}," + ",".join(str(round(value,2)) for value in row[4:]))
+
+
+
+##########################################################################
+## Main                                                                 ##
+##########################################################################
+if __name__ == '__main__':
+
+    args = parse_arguments()
+    log = setup_log()
+    setup_profile(args.profile, args.program_name, log)
+
+    log.info(args.program_name + ' begins')
+    # stored results are recomputed when any of these change
+    MODEL_SIGNATURE = [DRIVE_CAP, STRIPE_GEOMETRY, COEFFICIENTS]
+
+    # a scenario with no base starts from the ddp_configurator defaults
+    DEFAULTS = {
+        "drd" : 500.0,
+        "drs" : 400.0,
+        "ratio" : 4.0,
+        "depletion" : 90.0,
+        "jnl" : 10.0,
+        "drive" : "30TB-SSD",
+        "stripe" : "6+2",
+        "adr" : "Compression and Dedupe"
+    }
+
+    RESULT_FIELDS = ['pool_size','ddp_drives','ddp_capacity','ddp_effective','raid_pgs','raid_drives','raid_capacity','raid_effective']
+
+    db = open_store(args.db)
+    scenarios = load_scenarios(db)
+    match args.command:
+        case "add":
+            if args.name in scenarios:
+                fail('scenario ' + args.name + ' already exists')
+            if args.base and args.base not in scenarios:
+                fail('base scenario ' + args.base + ' does not exist')
+            overrides = parse_overrides(args.overrides)
+            scenarios[args.name] = (args.base, overrides)
+            check_inputs(scenarios)
+            db.execute("INSERT INTO scenarios (name, base, overrides) VALUES (?, ?, ?)", (args.name, args.base, json.dumps(overrides, sort_keys=True)))
+            db.commit()
+        case "update":
+            if args.name not in scenarios:
+                fail('scenario ' + args.name + ' does not exist')
+            overrides = scenarios[args.name][1]
+            overrides.update(parse_overrides(args.overrides))
+            for key in args.unset:
+                overrides.pop(key, None)
+            check_inputs(scenarios)
+            db.execute("UPDATE scenarios SET overrides = ? WHERE name = ?", (json.dumps(overrides, sort_keys=True), args.name))
+            db.commit()
+        case "remove":
+            if args.name not in scenarios:
+                fail('scenario ' + args.name + ' does not exist')
+            children = [name for name in scenarios if scenarios[name][0] == args.name]
+            if children:
+                fail('scenario ' + args.name + ' is the base of ' + ', '.join(children))
+            db.execute("DELETE FROM scenarios WHERE name = ?", (args.name,))
+            db.commit()
+        case "run":
+            recomputed, total = run(db)
+            print(f"{recomputed} of {total} scenarios recomputed")
+        case "list":
+            run(db)
+            print("Scenario,Base,Overrides," + ",".join(RESULT_FIELDS))
+            for row in db.execute("SELECT s.name, s.base, s.overrides, " + ", ".join("r." + field for field in RESULT_FIELDS) + " FROM scenarios s JOIN results r ON r.name = s.name ORDER BY s.name"):
+                overrides = "; ".join(key + "=" + str(value) for key, value in json.loads(row[2]).items())
+                print(f"{row[0]},{row[1] or ''},{overrides}," + ",".join(str(value) for value in row[3:]))
+        case "diff":
+            missing = [name for name in args.names if name not in scenarios]
+            if missing:
+                fail('no scenario ' + ', '.join(missing))
+            run(db)
+            diff(db, args.names)
+    db.close()
+
+    log.info(args.program_name + ' ends')
@@ -0,0 +1,196 @@
+#!/usr/local/bin/python3
+''' standard template
+
+ Script Name    : ddp_whatif.py
+ Created        : 20261019
+ Author         : John McDevitt
+ Function       : What-if sliders for ratio, depletion threshold and DRD effective capacity.
+                : DDP/RAID drive counts and effective supported are recomputed with the
+                : ddp_model sizing on every slider move
+ Usage          : ddp_whatif.py
+ Update Log     :
+
+'''
+
+##########################################################################
+## Imports                                                              ##
+##########################################################################
+import logging
+import logging.handlers
+import argparse
+import sys
+import os
+from tkinter import *
+from tkinter import ttk
+from ddp_profile import setup_profile, profile_stage
+from ddp_model import DRIVE_CAP, STRIPE_GEOMETRY, adr_overhead, pool_size_required, calc_ddp, calc_raid, effective_supported
+
+##########################################################################
+## Function definitions                                                 ##
+##########################################################################
+def parse_arguments():
+    ''' argument object
+
+    this is standard argument parsing.  add your required args below
+    '''
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-v', "--verbose", action='count',default=0)
+    parser.add_argument("--logfile", type=str)
+    parser.add_argument("--profile", type=str, nargs='?', const='.', help="write per stage cProfile and tracemalloc output to this directory")
+    args = parser.parse_args()
+    args.program_name=os.path.basename(sys.argv[0])
+    return args
+
+def setup_log():
+    ''' log object
+
+    Enable logging for the script utilizing the -v for verbose arguments
+    log.critical('crit') # always prints
+    log.error('error') # always logs
+    log.warning('warn') # logs with -v
+    log.info('info') # logs with -vv
+    log.debug('debug') # logs with -vvv
+    '''
+
+    # capture all log messages to the log files if provided
+    loglevel=logging.DEBUG
+
+    logformat='%(asctime)s %(name)s %(funcName)s %(levelname)s line: %(lineno)d %(message)s'
+    log = logging.getLogger(args.program_name)
+    log.setLevel(loglevel)
+    if args.logfile is None:
+        if 'LOGFILE' in os.environ:
+            if os.path.isdir(os.environ['LOGFILE']):
+                fh = logging.handlers.TimedRotatingFileHandler(os.path.join(os.environ['LOGFILE'],args.program_name + ".log"),'D',1,3)
+            else:
+                fh = logging.handlers.TimedRotatingFileHandler(os.environ['LOGFILE'],'D',1,3)
+            fh.setLevel(loglevel)
+            fh.setFormatter(logging.Formatter(logformat))
+    elif os.path.isdir(args.logfile):
+        fh = logging.handlers.TimedRotatingFileHandler(os.path.join(args.logfile,args.program_name + ".log"),'D',1,3)
+    else:
+        fh = logging.handlers.TimedRotatingFileHandler(args.logfile,'D',1,3)
+
+    if args.logfile or ('LOGFILE' in os.environ):
+        fh.setLevel(loglevel)
+        fh.setFormatter(logging.Formatter(logformat))
+        log.addHandler(fh)
+
+    # only log to the console if using -v
+    if args.verbose == 1:
+        loglevel = logging.WARNING
+    elif args.verbose == 2:
+        loglevel = logging.INFO
+    elif args.verbose > 2:
+        loglevel = logging.DEBUG
+    else:
+        loglevel = logging.ERROR
+
+    ch = logging.StreamHandler()
+    ch.setLevel(loglevel)
+    ch.setFormatter(logging.Formatter(logformat))
+    log.addHandler(ch)
+    return(log)
+
+def terminate(event=''):
+    sys.exit()
+
+def size_pool(drive, stripe, adr, ratio, depletion, effective):
+    ''' exact sizing of one point
+
+    ddp_configurator's sizing for a pool holding only DRD effective capacity.  returns
+    DDP drives configured, DDP effective supported, RAID PG drives and RAID effective
+    supported
+    '''
+    metadata, garbage = adr_overhead(adr, effective, 0, ratio)
+    pool_size = pool_size_required(0, effective, 0, ratio, depletion, adr)
+    required_drives, ddp_drives, ddp_capacity = calc_ddp(pool_size, drive, stripe)
+    pg_count, raid_drives, raid_capacity = calc_raid(pool_size, drive, stripe)
+    return(ddp_drives, effective_supported(ddp_capacity, depletion, ratio, effective, metadata, garbage),
+           raid_drives, effective_supported(raid_capacity, depletion, ratio, effective, metadata, garbage))
+
+def scrub(event=''):
+    ''' slider or menu changed: size the point shown on the slider labels '''
+    ratio = round(ratio_var.get(),2)
+    depletion = round(depletion_var.get())
+    effective = round(effective_var.get())
+    ratio_label.config(text=f"{ratio:.2f}")
+    depletion_label.config(text=str(depletion))
+    effective_label.config(text=str(effective))
+    with profile_stage('sizing'):
+        result = size_pool(drive_var.get(), stripe_var.get(), adr_var.get(), ratio, depletion, effective)
+    with profile_stage('rendering'):
+        for label, value in zip(figures, result):
+            label.config(text=str(value))
+
+
+
+##########################################################################
+## Main                                                                 ##
+##########################################################################
+if __name__ == '__main__':
+
+    args = parse_arguments()
+    log = setup_log()
+    setup_profile(args.profile, args.program_name, log)
+
+    log.info(args.program_name + ' begins')
+    ADR_OPTIONS =[
+    "Compression Only",
+    "Compression and Dedupe"
+    ]
+
+    # slider ranges (from, to)
+    RATIO_RANGE = (1.0, 8.0)
+    DEPLETION_RANGE = (80, 100)
+    EFFECTIVE_RANGE = (0, 3000)
+
+    window = Tk()
+    window.title("DDP what-if")
+    window.bind("q",terminate)
+
+    drive_var = StringVar()
+    drive_var.set('30TB-SSD')
+    stripe_var = StringVar()
+    stripe_var.set('6+2')
+    adr_var = StringVar()
+    adr_var.set("Compression and Dedupe")
+    ratio_var = DoubleVar()
+    ratio_var.set(4.0)
+    depletion_var = DoubleVar()
+    depletion_var.set(90)
+    effective_var = DoubleVar()
+    effective_var.set(500)
+
+    ttk.Label(window,text="DRIVE TYPE").grid(row=0,column=0,sticky=W)
+    OptionMenu(window,drive_var,*DRIVE_CAP,command=scrub).grid(row=0,column=1,columnspan=2,sticky=EW)
+    ttk.Label(window,text="Stripe configuration").grid(row=1,column=0,sticky=W)
+    OptionMenu(window,stripe_var,*STRIPE_GEOMETRY,command=scrub).grid(row=1,column=1,columnspan=2,sticky=EW)
+    ttk.Label(window,text="Data Reduction Selection").grid(row=2,column=0,sticky=W)
+    OptionMenu(window,adr_var,*ADR_OPTIONS,command=scrub).grid(row=2,column=1,columnspan=2,sticky=EW)
+
+    ttk.Label(window,text="ADR ratio").grid(row=3,column=0,sticky=W)
+    ttk.Scale(window,from_=RATIO_RANGE[0],to=RATIO_RANGE[1],variable=ratio_var,length=250,command=scrub).grid(row=3,column=1)
+    ratio_label = ttk.Label(window,width=6)
+    ratio_label.grid(row=3,column=2)
+    ttk.Label(window,text="HDP Depletion threshold (%)").grid(row=4,column=0,sticky=W)
+    ttk.Scale(window,from_=DEPLETION_RANGE[0],to=DEPLETION_RANGE[1],variable=depletion_var,length=250,command=scrub).grid(row=4,column=1)
+    depletion_label = ttk.Label(window,width=6)
+    depletion_label.grid(row=4,column=2)
+    ttk.Label(window,text="DRD effective capacity (TiB)").grid(row=5,column=0,sticky=W)
+    ttk.Scale(window,from_=EFFECTIVE_RANGE[0],to=EFFECTIVE_RANGE[1],variable=effective_var,length=250,command=scrub).grid(row=5,column=1)
+    effective_label = ttk.Label(window,width=6)
+    effective_label.grid(row=5,column=2)
+
+    ttk.Separator(window,orient="horizontal").grid(row=6,columnspan=3,sticky="ew")
+    figures = []
+    for row, text in enumerate(["Total DDP drives configured: ","DDP Effective supported(TiB): ","Total PG drives configured: ","RAID Effective supported(TiB): "]):
+        ttk.Label(window,text=text).grid(row=7+row,column=0,sticky=W)
+        figures.append(ttk.Label(window,foreground="orange" if row%2==0 else "red"))
+        figures[row].grid(row=7+row,column=1)
+
+    scrub()
+    window.mainloop()
+
+    log.info(args.program_name + ' ends')
@@ -22,6 +22,8 @@ import os
 from tkinter import *
 from tkinter import messagebox
 from tkinter import ttk
+from ddp_profile import setup_profile, profile_stage
+from ddp_model import COEFFICIENTS, effective_for_usable
 
 ##########################################################################
 ## Function definitions                                                 ##
@@ -35,6 +37,7 @@ def parse_arguments():
     parser = argparse.ArgumentParser()
     parser.add_argument('-v', "--verbose", action='count',default=0)
     parser.add_argument("--logfile", type=str)
+    parser.add_argument("--profile", type=str, nargs='?', const='.', help="write per stage cProfile and tracemalloc output to this directory")
     args = parser.parse_args()
     args.program_name=os.path.basename(sys.argv[0])
     return args
@@ -103,12 +106,19 @@ def calculate(event=''):
     # effective = ratio * usable / ((ratio * 0.06) + 1.07)
     # DRD metadata is 3% of effective
     # effective = ratio * usable / ((ratio * 0.03) + 1.07)
-    effective = attainment_ratio.get() * useable_cap.get() / ((attainment_ratio.get() * 0.06) + 1.07)
-    DRD_effective = attainment_ratio.get() * useable_cap.get() / ((attainment_ratio.get() * 0.03) + 1.07)
+    # rates are the Compression and Dedupe coefficients in ddp_model
+    drd_metadata, drs_metadata, garbage = COEFFICIENTS["Compression and Dedupe"]
+    with profile_stage('input'):
+        ratio = attainment_ratio.get()
+        usable = useable_cap.get()
+    with profile_stage('sizing'):
+        effective = effective_for_usable(usable, ratio, drs_metadata, garbage)
+        DRD_effective = effective_for_usable(usable, ratio, drd_metadata, garbage)
     
-    #ttk.Label(window,text="Effective Capacity", width=20).grid(row=3,column=0,sticky=W)
-    ttk.Label(window,text=str(round(effective,2)),width=10).grid(row=3,column=1)
-    ttk.Label(window,text=str(round(DRD_effective,2)),width=10).grid(row=4,column=1)
+    with profile_stage('rendering'):
+        #ttk.Label(window,text="Effective Capacity", width=20).grid(row=3,column=0,sticky=W)
+        ttk.Label(window,text=str(round(effective,2)),width=10).grid(row=3,column=1)
+        ttk.Label(window,text=str(round(DRD_effective,2)),width=10).grid(row=4,column=1)
     
 
 
@@ -120,6 +130,7 @@ if __name__ == '__main__':
   
     args = parse_arguments()
     log = setup_log()
+    setup_profile(args.profile, args.program_name, log)
 
     log.info(args.program_name + ' begins')
 
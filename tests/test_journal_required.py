@@ -0,0 +1,65 @@
+''' journal_required against a brute force outage search '''
+
+import math
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ddp_configurator import journal_required
+
+
+def backlog_at(samples, link_mbps, s):
+    ''' journal backlog at time s, rate of each sample applying since the previous one '''
+    backlog = 0.0
+    for (previous, _), (seconds, rate) in zip(samples, samples[1:]):
+        if s <= previous:
+            break
+        end = min(s, seconds)
+        backlog = max(0.0, backlog + (rate-link_mbps)*(end-previous))
+    return(backlog)
+
+def written_between(samples, start, end):
+    return(sum(rate*max(0.0, min(end, seconds) - max(start, previous)) for (previous, _), (seconds, rate) in zip(samples, samples[1:])))
+
+def brute_force_tib(samples, link_mbps, outage_seconds):
+    ''' worst backlog plus outage writes over sample aligned and evenly spaced outage starts '''
+    first, last = samples[0][0], samples[-1][0]
+    starts = [t for t, _ in samples] + [t - outage_seconds for t, _ in samples]
+    starts += [first - outage_seconds + k*(last - first + outage_seconds)/2000 for k in range(2001)]
+    required_mb = max(backlog_at(samples, link_mbps, s) + written_between(samples, s, min(s + outage_seconds, last)) for s in starts)
+    return(required_mb*10**6/2**40)
+
+def assert_matches(samples, link_mbps, outage_seconds):
+    expected = brute_force_tib(samples, link_mbps, outage_seconds)*100
+    result = round(journal_required(iter(samples), link_mbps, outage_seconds)*100)
+    # the reference is in MB; allow for it landing on a 0.01 TiB step
+    assert math.ceil(expected - 1e-6) <= result <= math.ceil(expected + 1e-6), (samples, link_mbps, outage_seconds)
+
+
+def test_outage_inside_one_sample_interval():
+    # 5 minute samples at 500 MB/s never outrun a 1000 MB/s link, but a 1 minute outage
+    # still journals 60 s of writes: 30,000 MB
+    samples = [(k*300, 500.0) for k in range(13)]
+    assert journal_required(iter(samples), 1000, 60) == 0.03
+    assert_matches(samples, 1000, 60)
+
+def test_outage_straddles_interval_start():
+    samples = [(0, 0.0), (100, 20000.0), (400, 100.0), (700, 30000.0), (760, 0.0)]
+    for outage_seconds in (30, 150, 250, 330, 500):
+        assert_matches(samples, 5000, outage_seconds)
+
+def test_backlog_and_outage_longer_than_trace():
+    samples = [(0, 0.0), (60, 9000.0), (120, 9000.0), (180, 100.0)]
+    assert_matches(samples, 2000, 0)
+    assert_matches(samples, 2000, 600)
+
+def test_random_traces():
+    rng = random.Random(20261019)
+    for _ in range(200):
+        seconds = rng.uniform(0, 1000)
+        samples = []
+        for _ in range(rng.randint(2, 25)):
+            samples.append((seconds, rng.choice([0.0, rng.uniform(0, 6000), rng.uniform(0, 60000)])))
+            seconds += rng.choice([1, 60, 300, rng.uniform(0.5, 900)])
+        assert_matches(samples, rng.uniform(500, 20000), rng.choice([0, 1, 45, 300, rng.uniform(0, 3600)]))
@@ -0,0 +1,66 @@
+''' workload model and min_drives sizing in ddp_model '''
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ddp_model import DRIVE_CAP, DRIVE_PERF, RAID6_WRITE_PENALTY, STRIPE_GEOMETRY
+from ddp_model import calc_ddp, calc_raid, candidate_layouts, layout_performance, performance_drives, workload_cost
+
+
+def test_catalog_has_performance_for_every_drive():
+    assert set(DRIVE_PERF) == set(DRIVE_CAP)
+
+def test_all_reads_cost_one_drive_io():
+    for drive, (read_iops, write_iops, read_mbs, write_mbs) in DRIVE_PERF.items():
+        assert layout_performance(32, drive, 14, 16, 100) == (32*read_iops, 32*read_mbs)
+
+def test_all_writes_pay_raid6_penalty():
+    assert RAID6_WRITE_PENALTY == 6
+    read_iops, write_iops, read_mbs, write_mbs = DRIVE_PERF["30TB-SSD"]
+    for stripe, (data, parity, efficiency) in STRIPE_GEOMETRY.items():
+        iops, mbs = layout_performance(48, "30TB-SSD", data, parity, 0)
+        # random writes: 6 back end IOs each, whatever the stripe width
+        assert iops == round(48*write_iops/6)
+        # sequential writes: only the data share of each stripe is host data
+        assert mbs == round(48*write_mbs*data/parity)
+
+def test_mixed_workload_between_read_and_write():
+    per_io_read = workload_cost("15TB-SSD", 6, 8, 100)[0]
+    per_io_write = workload_cost("15TB-SSD", 6, 8, 0)[0]
+    assert workload_cost("15TB-SSD", 6, 8, 70)[0] == pytest.approx(0.7*per_io_read + 0.3*per_io_write)
+
+def test_no_target_needs_no_drives():
+    assert performance_drives("30TB-SSD", 14, 16, 0, 0, 70) == 0
+
+def test_performance_drives_meet_target():
+    for read_pct in (0, 30, 70, 100):
+        drives = performance_drives("30TB-SSD", 6, 8, 200000, 3000, read_pct)
+        iops, mbs = layout_performance(drives, "30TB-SSD", 6, 8, read_pct)
+        assert iops >= 200000 and mbs >= 3000
+        iops, mbs = layout_performance(drives-1, "30TB-SSD", 6, 8, read_pct)
+        assert iops < 200000 or mbs < 3000
+
+def test_calc_ddp_min_drives():
+    # 10 TiB fits in one 6+2 stripe of 30TB drives
+    assert calc_ddp(10, "30TB-SSD", "6+2") == (8, 9, 8*DRIVE_CAP["30TB-SSD"]/1024*.75)
+    # a workload needing 40 drives raises the DDP to 40, plus 2 drives of spare space
+    assert calc_ddp(10, "30TB-SSD", "6+2", 40) == (40, 42, 40*DRIVE_CAP["30TB-SSD"]/1024*.75)
+    # below the capacity requirement min_drives changes nothing
+    assert calc_ddp(1000, "30TB-SSD", "6+2", 40) == calc_ddp(1000, "30TB-SSD", "6+2")
+
+def test_calc_raid_min_drives():
+    assert calc_raid(10, "30TB-SSD", "14+2") == (1, 16, 14*DRIVE_CAP["30TB-SSD"]/1024)
+    # 40 drives of 14+2 PGs round up to 3 PGs
+    assert calc_raid(10, "30TB-SSD", "14+2", 40) == (3, 48, 3*14*DRIVE_CAP["30TB-SSD"]/1024)
+    assert calc_raid(10, "30TB-SSD", "6+2", 40) == (5, 40, 5*6*DRIVE_CAP["30TB-SSD"]/1024)
+    assert calc_raid(1000, "30TB-SSD", "6+2", 40) == calc_raid(1000, "30TB-SSD", "6+2")
+
+def test_candidate_layouts_carry_the_workload():
+    layouts = candidate_layouts(50, 300000, 5000, 70)
+    assert len(layouts) == 2*len(DRIVE_CAP)*len(STRIPE_GEOMETRY)
+    for layout, drive, stripe, drives, capacity, iops, mbs in layouts:
+        assert capacity >= 50
+        assert iops >= 300000 and mbs >= 5000